@@ -1,27 +1,34 @@
 #!/usr/bin/env python3
 """Delete the test posts immediately."""
 
+from concurrent.futures import ThreadPoolExecutor
+
 from policyengine_social.publishers.x_multi import MultiAccountXPublisher
 
 # Initialize publisher
 publisher = MultiAccountXPublisher()
 
-# Delete from @thepolicyengine
-tweet_id_1 = "1957747132963672372"
-print(f"Deleting tweet {tweet_id_1} from @thepolicyengine...")
-try:
-    client = publisher.clients['thepolicyengine']
-    response = client.delete_tweet(tweet_id_1)
-    print("✅ Deleted from @thepolicyengine")
-except Exception as e:
-    print(f"❌ Error: {e}")
-
-# Delete from @policyengineus  
-tweet_id_2 = "1957747133894787313"
-print(f"Deleting tweet {tweet_id_2} from @policyengineus...")
-try:
-    client = publisher.clients['policyengineus']
-    response = client.delete_tweet(tweet_id_2)
-    print("✅ Deleted from @policyengineus")
-except Exception as e:
-    print(f"❌ Error: {e}")
\ No newline at end of file
+# Tweets to delete, by account
+to_delete = [
+    ("thepolicyengine", "1957747132963672372"),
+    ("policyengineus", "1957747133894787313"),
+]
+
+
+def _del(account, tweet_id):
+    """Delete one tweet and report the outcome."""
+    try:
+        client = publisher.clients[account]
+        client.delete_tweet(tweet_id)
+        return f"✅ Deleted {tweet_id} from @{account}"
+    except Exception as e:
+        return f"❌ Error deleting {tweet_id} from @{account}: {e}"
+
+
+# Each account has its own client, so delete from both at once
+for account, tweet_id in to_delete:
+    print(f"Deleting tweet {tweet_id} from @{account}...")
+
+with ThreadPoolExecutor(max_workers=len(to_delete)) as executor:
+    for message in executor.map(lambda pair: _del(*pair), to_delete):
+        print(message)
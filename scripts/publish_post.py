@@ -4,320 +4,475 @@ Publish a validated post from YAML file.
 This should ONLY be run by GitHub Actions after PR approval.
 """
 
-import sys
-import yaml
 import argparse
-from pathlib import Path
+import asyncio
+import functools
 import os
+import random
+import re
+import sys
 import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+from dotenv import load_dotenv
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from policyengine_social.publishers.x_multi import MultiAccountXPublisher
-from policyengine_social.publishers.bluesky import MultiAccountBlueSkyPublisher
-from policyengine_social.publishers.zapier import ZapierPublisher
+from policyengine_social.ratelimit import TokenBucket  # noqa: E402
+from policyengine_social.yaml_utils import load_post, pop_parsed  # noqa: E402
+
+# Per-account write budgets as (burst capacity, tokens per second).
+# X's free tier allows roughly 50 writes per 15 minutes; Bluesky's
+# limits are far more generous.
+RATE_LIMITS = {
+    "x": (5, 50 / (15 * 60)),
+    "bluesky": (10, 0.4),
+}
+
+# Failed calls are retried when the error looks like a rate limit or a
+# server-side failure, backing off exponentially between attempts.
+MAX_RETRIES = 3
+MAX_BACKOFF_SECONDS = 60
+TRANSIENT_ERROR_RE = re.compile(
+    r"\b(429|50[0-4])\b|Too Many Requests|Service Unavailable", re.I
+)
+
+BANNER = "=" * 50
+
+
+@functools.lru_cache(maxsize=None)
+def _x_publisher():
+    """Return a shared X publisher, authenticating each account only once."""
+    # Imported here so posts that don't target X never load tweepy
+    from policyengine_social.publishers.x_multi import MultiAccountXPublisher
+
+    return MultiAccountXPublisher()
+
+
+@functools.lru_cache(maxsize=None)
+def _bluesky_publisher():
+    """Return a shared Bluesky publisher, logging in each account only once."""
+    # Imported here so posts that don't target Bluesky never load atproto
+    from policyengine_social.publishers.bluesky import MultiAccountBlueSkyPublisher
+
+    return MultiAccountBlueSkyPublisher()
+
+
+@functools.lru_cache(maxsize=None)
+def _rate_limiter(platform, account):
+    """Return the token bucket for one account on one platform."""
+    capacity, refill_per_sec = RATE_LIMITS[platform]
+    return TokenBucket(capacity, refill_per_sec)
+
+
+def _is_transient(result):
+    """Check whether a failed publisher result is worth retrying.
+
+    Threads that failed partway are never retried, since that would
+    repost the posts that did go through.
+    """
+    return (
+        not result["success"]
+        and not result.get("posts")
+        and TRANSIENT_ERROR_RE.search(str(result.get("error", ""))) is not None
+    )
+
+
+def _backoff(attempt, results=()):
+    """Sleep before retry number ``attempt + 1``.
+
+    Waits at least as long as any of the failed ``results`` were told to
+    by the API, with up to 20% jitter so accounts don't retry in lockstep.
+    """
+    waits = [r["retry_after"] for r in results if r.get("retry_after")]
+    delay = max([2**attempt, *waits])
+    time.sleep(min(delay * (1 + random.random() * 0.2), MAX_BACKOFF_SECONDS))
+
+
+def _with_retry(fn, bucket, max_retries=MAX_RETRIES):
+    """Call a publisher method, retrying rate limits and server errors.
+
+    Every attempt first takes a token from the account's bucket, so
+    retries are paced by the same budget as ordinary writes.
+
+    Args:
+        fn: Zero-argument callable returning a publisher result dict
+        bucket: TokenBucket for the account making the call
+        max_retries: Number of retries after the first attempt
+
+    Returns:
+        Result of the last attempt
+    """
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        result = fn()
+        if attempt == max_retries or not _is_transient(result):
+            return result
+        _backoff(attempt, [result])
+
+
+def _repost_with_retry(platform, repost, accounts, max_retries=MAX_RETRIES):
+    """Repost from several accounts, retrying only the ones that hit transient errors.
+
+    Args:
+        platform: Platform name, used to pick each account's token bucket
+        repost: Callable taking ``to_accounts`` and returning results by account
+        accounts: Accounts that should repost
+        max_retries: Number of retries after the first attempt
+
+    Returns:
+        Dict of results by account
+    """
+    results = {}
+    pending = list(accounts)
+    for attempt in range(max_retries + 1):
+        for account in pending:
+            _rate_limiter(platform, account).acquire()
+        results.update(repost(to_accounts=pending))
+        pending = [acc for acc in pending if _is_transient(results[acc])]
+        if not pending or attempt == max_retries:
+            return results
+        _backoff(attempt, [results[acc] for acc in pending])
+
+
+def _post_to_accounts(platform, publisher, config, accounts):
+    """Post the same content from several accounts concurrently.
+
+    Each account has its own API client, so the requests are independent
+    and can be in flight at the same time.
+
+    Yields:
+        (account, result) tuples in completion order
+    """
+    if "thread" not in config and "post" not in config:
+        return
+
+    images = config.get("images")
+
+    def _post_one(account):
+        if "thread" in config:
+            call = functools.partial(
+                publisher.post_thread,
+                posts=config["thread"],
+                account=account,
+                images=images,
+            )
+        else:
+            call = functools.partial(
+                publisher.post, text=config["post"], account=account, images=images
+            )
+        return account, _with_retry(call, _rate_limiter(platform, account))
+
+    with ThreadPoolExecutor(max_workers=max(len(accounts), 1)) as executor:
+        futures = [executor.submit(_post_one, account) for account in accounts]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def _format_account_result(account, result):
+    """Describe the outcome of a post or thread from one account."""
+    if not result["success"]:
+        return f"❌ @{account} failed: {result.get('error')}"
+    elif "thread_url" in result:
+        return f"✅ @{account} posted thread: {result['thread_url']}"
+    else:
+        return f"✅ @{account} posted: {result['url']}"
+
+
+def _render_content(config):
+    """Format the thread or single post of a platform config."""
+    if "thread" in config:
+        return [f"    [{i}] {text}" for i, text in enumerate(config["thread"], 1)]
+    elif "post" in config:
+        return [f"    {config['post']}"]
+    return []
+
+
+def _render_accounts(header, config):
+    """Format the X or Bluesky part of a post for a dry run.
+
+    Returns:
+        List of console lines, or an empty list if no accounts are set
+    """
+    if "post_from" in config:
+        lines = [header, f"  Post from @{config['post_from']}:"]
+        lines.extend(_render_content(config))
+        repost_accounts = config.get("repost_from", [])
+        if repost_accounts:
+            handles = ", ".join("@" + acc for acc in repost_accounts)
+            lines.append(f"  Then repost from: {handles}")
+        return lines
+
+    elif "accounts" in config:
+        lines = [header]
+        content = _render_content(config)
+        for account in config["accounts"]:
+            lines.append(f"  @{account}:")
+            lines.extend(content)
+        return lines
+
+    return []
+
+
+def _render_linkedin(linkedin_config):
+    """Format the LinkedIn part of a post for a dry run."""
+    return [
+        "\n[DRY RUN] LinkedIn post:",
+        f"  {linkedin_config['content'][:200]}...",
+    ]
+
+
+def _render_dry_run(platforms):
+    """Describe everything a post would publish without calling any API.
+
+    Args:
+        platforms: The post's platform configs, keyed by platform name
+
+    Returns:
+        Console output for all platforms
+    """
+    lines = []
+    if "x" in platforms:
+        lines.extend(_render_accounts("[DRY RUN] X posts:", platforms["x"]))
+    if "bluesky" in platforms:
+        lines.extend(
+            _render_accounts("\n[DRY RUN] Bluesky posts:", platforms["bluesky"])
+        )
+    if "linkedin" in platforms:
+        lines.extend(_render_linkedin(platforms["linkedin"]))
+    return "".join(f"{line}\n" for line in lines)
+
+
+# Platforms published through _publish_platform(), as (name, publisher
+# factory, console prefix, result field holding the id that reposts need)
+PLATFORMS = [
+    ("x", _x_publisher, "🐦 Posting to", "tweet_id"),
+    ("bluesky", _bluesky_publisher, "🦋 Posting to Bluesky", "uri"),
+]
+
+
+def _publish_platform(config, spec):
+    """Publish the X or Bluesky part of a post.
+
+    Args:
+        config: The platform's section of the post
+        spec: The platform's row in PLATFORMS
+
+    Returns:
+        List of console lines describing what happened
+    """
+    platform, get_publisher, prefix, id_field = spec
+    lines = []
+    log = lines.append
+
+    # Legacy format with accounts list
+    if "post_from" not in config:
+        if "accounts" in config:
+            publisher = get_publisher()
+            accounts = config["accounts"]
+
+            log(f"\n{prefix} {', '.join(['@' + acc for acc in accounts])}...")
+            results = _post_to_accounts(platform, publisher, config, accounts)
+            for account, result in results:
+                log(_format_account_result(account, result))
+        return lines
+
+    # New format with post_from and repost_from
+    main_account = config["post_from"]
+    repost_accounts = config.get("repost_from", [])
+    images = config.get("images")
+    publisher = get_publisher()
+
+    log(f"\n{prefix} @{main_account}...")
+
+    if "thread" in config:
+        call = functools.partial(
+            publisher.post_thread,
+            posts=config["thread"],
+            account=main_account,
+            images=images,
+        )
+    elif "post" in config:
+        call = functools.partial(
+            publisher.post, text=config["post"], account=main_account, images=images
+        )
+    else:
+        return lines
+
+    result = _with_retry(call, _rate_limiter(platform, main_account))
+    if not result["success"]:
+        log(f"❌ Failed: {result.get('error')}")
+        return lines
+
+    if "thread" in config:
+        log(f"✅ Posted thread: {result['thread_url']}")
+        post_id = result["posts"][0][id_field]  # First post of thread
+    else:
+        log(f"✅ Posted: {result['url']}")
+        post_id = result[id_field]
+
+    # Repost from other accounts
+    if repost_accounts:
+        log("\n🔄 Reposting from other accounts...")
+        repost_results = _repost_with_retry(
+            platform,
+            functools.partial(
+                publisher.repost, from_account=main_account, **{id_field: post_id}
+            ),
+            repost_accounts,
+        )
+        for acc, res in repost_results.items():
+            if res["success"]:
+                log(f"  ✅ @{acc} reposted")
+            else:
+                log(f"  ❌ @{acc} failed: {res.get('error')}")
+
+    return lines
+
+
+def _publish_linkedin(linkedin_config):
+    """Publish the LinkedIn part of a post.
+
+    Returns:
+        List of console lines describing what happened
+    """
+    webhook_url = os.getenv("ZAPIER_LINKEDIN_WEBHOOK")
+    if not webhook_url:
+        # Without a webhook there is nowhere to post, so fall back to a preview
+        return _render_linkedin(linkedin_config)
+
+    from policyengine_social.publishers.zapier import ZapierPublisher
+
+    lines = ["\n💼 Posting to LinkedIn..."]
+    with ZapierPublisher(webhook_url) as zapier:
+        # X is posted natively, so only ask the webhook for LinkedIn
+        result = zapier.publish(
+            content=linkedin_config["content"],
+            link=linkedin_config.get("article_url"),
+            platforms=["linkedin"],
+        )
+    if result["success"]:
+        lines.append("✅ Sent to LinkedIn via Zapier")
+    else:
+        lines.append(f"❌ Failed: {result.get('error')}")
+
+    return lines
+
+
+# Platform handlers, in the order their output is reported
+PLATFORM_HANDLERS = [
+    *((spec[0], functools.partial(_publish_platform, spec=spec)) for spec in PLATFORMS),
+    ("linkedin", _publish_linkedin),
+]
+
+
+async def _publish_platforms(platforms):
+    """Publish to every configured platform at once.
+
+    The publishers are synchronous, so each platform runs in its own
+    worker thread and total time is that of the slowest platform rather
+    than the sum of all of them.
+
+    A platform that raises doesn't stop the others, whose output is still
+    needed to tell which posts went live.
+
+    Returns:
+        List of (platform name, console lines or the exception raised),
+        in PLATFORM_HANDLERS order
+    """
+    names = [name for name, _ in PLATFORM_HANDLERS if name in platforms]
+    tasks = [
+        asyncio.to_thread(handler, platforms[name])
+        for name, handler in PLATFORM_HANDLERS
+        if name in platforms
+    ]
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    return list(zip(names, results))
 
 
 def publish_post(filepath, prod=False):
     """Publish a post from YAML file.
-    
+
     Args:
         filepath: Path to post YAML file
         prod: If True, actually post. If False, dry run only.
     """
-    with open(filepath, 'r') as f:
-        post = yaml.safe_load(f)
-    
-    print(f"\n{'='*50}")
-    print(f"📱 Processing: {post.get('title', 'Untitled')}")
-    print(f"{'='*50}\n")
-    
-    results = []
-    
-    # Process X posts
-    if 'x' in post.get('platforms', {}):
-        x_config = post['platforms']['x']
-        
-        # Handle new format with post_from and repost_from
-        if 'post_from' in x_config:
-            main_account = x_config['post_from']
-            repost_accounts = x_config.get('repost_from', [])
-            
-            if prod:
-                publisher = MultiAccountXPublisher()
-                
-                # Post from main account
-                print(f"\n🐦 Posting to @{main_account}...")
-                
-                if 'thread' in x_config:
-                    result = publisher.post_thread(
-                        posts=x_config['thread'],
-                        account=main_account,
-                        images=x_config.get('images')
-                    )
-                    if result['success']:
-                        print(f"✅ Posted thread: {result['thread_url']}")
-                        tweet_id = result['posts'][0]['tweet_id']  # First tweet of thread
-                        
-                        # Repost from other accounts
-                        if repost_accounts:
-                            print(f"\n🔄 Reposting from other accounts...")
-                            time.sleep(2)  # Wait a bit before reposting
-                            repost_results = publisher.repost(
-                                tweet_id=tweet_id,
-                                from_account=main_account,
-                                to_accounts=repost_accounts
-                            )
-                            for acc, res in repost_results.items():
-                                if res['success']:
-                                    print(f"  ✅ @{acc} reposted")
-                                else:
-                                    print(f"  ❌ @{acc} failed: {res.get('error')}")
-                    else:
-                        print(f"❌ Failed: {result.get('error')}")
-                
-                elif 'post' in x_config:
-                    result = publisher.post(
-                        text=x_config['post'],
-                        account=main_account,
-                        images=x_config.get('images')
-                    )
-                    if result['success']:
-                        print(f"✅ Posted: {result['url']}")
-                        tweet_id = result['tweet_id']
-                        
-                        # Repost from other accounts
-                        if repost_accounts:
-                            print(f"\n🔄 Reposting from other accounts...")
-                            time.sleep(2)  # Wait a bit before reposting
-                            repost_results = publisher.repost(
-                                tweet_id=tweet_id,
-                                from_account=main_account,
-                                to_accounts=repost_accounts
-                            )
-                            for acc, res in repost_results.items():
-                                if res['success']:
-                                    print(f"  ✅ @{acc} reposted")
-                                else:
-                                    print(f"  ❌ @{acc} failed: {res.get('error')}")
-                    else:
-                        print(f"❌ Failed: {result.get('error')}")
-            else:
-                print("[DRY RUN] X posts:")
-                print(f"  Post from @{main_account}:")
-                if 'thread' in x_config:
-                    for i, tweet in enumerate(x_config['thread'], 1):
-                        print(f"    [{i}] {tweet}")
-                elif 'post' in x_config:
-                    print(f"    {x_config['post']}")
-                if repost_accounts:
-                    print(f"  Then repost from: {', '.join(['@' + acc for acc in repost_accounts])}")
-        
-        # Legacy format with accounts list
-        elif 'accounts' in x_config:
-            if prod:
-                publisher = MultiAccountXPublisher()
-                
-                for account in x_config.get('accounts', []):
-                    print(f"\n🐦 Posting to @{account}...")
-                    
-                    if 'thread' in x_config:
-                        result = publisher.post_thread(
-                            posts=x_config['thread'],
-                            account=account,
-                            images=x_config.get('images')
-                        )
-                        if result['success']:
-                            print(f"✅ Posted thread: {result['thread_url']}")
-                        else:
-                            print(f"❌ Failed: {result.get('error')}")
-                    
-                    elif 'post' in x_config:
-                        result = publisher.post(
-                            text=x_config['post'],
-                            account=account,
-                            images=x_config.get('images')
-                        )
-                        if result['success']:
-                            print(f"✅ Posted: {result['url']}")
-                        else:
-                            print(f"❌ Failed: {result.get('error')}")
-            else:
-                print("[DRY RUN] X posts:")
-                for account in x_config.get('accounts', []):
-                    print(f"  @{account}:")
-                    if 'thread' in x_config:
-                        for i, tweet in enumerate(x_config['thread'], 1):
-                            print(f"    [{i}] {tweet}")
-                    elif 'post' in x_config:
-                        print(f"    {x_config['post']}")
-    
-    # Process Bluesky posts
-    if 'bluesky' in post.get('platforms', {}):
-        bluesky_config = post['platforms']['bluesky']
-        
-        # Handle new format with post_from and repost_from
-        if 'post_from' in bluesky_config:
-            main_account = bluesky_config['post_from']
-            repost_accounts = bluesky_config.get('repost_from', [])
-            
-            if prod:
-                publisher = MultiAccountBlueSkyPublisher()
-                
-                # Post from main account
-                print(f"\n🦋 Posting to Bluesky @{main_account}...")
-                
-                if 'thread' in bluesky_config:
-                    result = publisher.post_thread(
-                        posts=bluesky_config['thread'],
-                        account=main_account,
-                        images=bluesky_config.get('images')
-                    )
-                    if result['success']:
-                        print(f"✅ Posted thread: {result['thread_url']}")
-                        post_uri = result['posts'][0]['uri']  # First post of thread
-                        
-                        # Repost from other accounts
-                        if repost_accounts:
-                            print(f"\n🔄 Reposting from other accounts...")
-                            time.sleep(2)  # Wait a bit before reposting
-                            repost_results = publisher.repost(
-                                uri=post_uri,
-                                from_account=main_account,
-                                to_accounts=repost_accounts
-                            )
-                            for acc, res in repost_results.items():
-                                if res['success']:
-                                    print(f"  ✅ @{acc} reposted")
-                                else:
-                                    print(f"  ❌ @{acc} failed: {res.get('error')}")
-                    else:
-                        print(f"❌ Failed: {result.get('error')}")
-                
-                elif 'post' in bluesky_config:
-                    result = publisher.post(
-                        text=bluesky_config['post'],
-                        account=main_account,
-                        images=bluesky_config.get('images')
-                    )
-                    if result['success']:
-                        print(f"✅ Posted: {result['url']}")
-                        post_uri = result['uri']
-                        
-                        # Repost from other accounts
-                        if repost_accounts:
-                            print(f"\n🔄 Reposting from other accounts...")
-                            time.sleep(2)  # Wait a bit before reposting
-                            repost_results = publisher.repost(
-                                uri=post_uri,
-                                from_account=main_account,
-                                to_accounts=repost_accounts
-                            )
-                            for acc, res in repost_results.items():
-                                if res['success']:
-                                    print(f"  ✅ @{acc} reposted")
-                                else:
-                                    print(f"  ❌ @{acc} failed: {res.get('error')}")
-                    else:
-                        print(f"❌ Failed: {result.get('error')}")
-            else:
-                print("\n[DRY RUN] Bluesky posts:")
-                print(f"  Post from @{main_account}:")
-                if 'thread' in bluesky_config:
-                    for i, post_text in enumerate(bluesky_config['thread'], 1):
-                        print(f"    [{i}] {post_text}")
-                elif 'post' in bluesky_config:
-                    print(f"    {bluesky_config['post']}")
-                if repost_accounts:
-                    print(f"  Then repost from: {', '.join(['@' + acc for acc in repost_accounts])}")
-        
-        # Legacy format with accounts list
-        elif 'accounts' in bluesky_config:
-            if prod:
-                publisher = MultiAccountBlueSkyPublisher()
-                
-                for account in bluesky_config.get('accounts', []):
-                    print(f"\n🦋 Posting to Bluesky @{account}...")
-                    
-                    if 'thread' in bluesky_config:
-                        result = publisher.post_thread(
-                            posts=bluesky_config['thread'],
-                            account=account,
-                            images=bluesky_config.get('images')
-                        )
-                        if result['success']:
-                            print(f"✅ Posted thread: {result['thread_url']}")
-                        else:
-                            print(f"❌ Failed: {result.get('error')}")
-                    
-                    elif 'post' in bluesky_config:
-                        result = publisher.post(
-                            text=bluesky_config['post'],
-                            account=account,
-                            images=bluesky_config.get('images')
-                        )
-                        if result['success']:
-                            print(f"✅ Posted: {result['url']}")
-                        else:
-                            print(f"❌ Failed: {result.get('error')}")
-            else:
-                print("\n[DRY RUN] Bluesky posts:")
-                for account in bluesky_config.get('accounts', []):
-                    print(f"  @{account}:")
-                    if 'thread' in bluesky_config:
-                        for i, post_text in enumerate(bluesky_config['thread'], 1):
-                            print(f"    [{i}] {post_text}")
-                    elif 'post' in bluesky_config:
-                        print(f"    {bluesky_config['post']}")
-    
-    # Process LinkedIn posts
-    if 'linkedin' in post.get('platforms', {}):
-        linkedin_config = post['platforms']['linkedin']
-        
-        if prod and os.getenv('ZAPIER_LINKEDIN_WEBHOOK'):
-            print(f"\n💼 Posting to LinkedIn...")
-            zapier = ZapierPublisher(os.getenv('ZAPIER_LINKEDIN_WEBHOOK'))
-            result = zapier.publish(
-                content=linkedin_config['content'],
-                link=linkedin_config.get('article_url')
-            )
-            if result['success']:
-                print(f"✅ Sent to LinkedIn via Zapier")
-            else:
-                print(f"❌ Failed: {result.get('error')}")
+    # Reuse validate_post.py's parse when it was run with --cache
+    post = pop_parsed(filepath)
+    if post is None:
+        post = load_post(filepath)
+
+    title = post.get("title", "Untitled")
+    platforms = post.get("platforms") or {}
+
+    if not prod:
+        output = _render_dry_run(platforms)
+        sys.stdout.write(
+            f"\n{BANNER}\n📱 Processing: {title}\n{BANNER}\n\n"
+            f"{output}\n{BANNER}\n📱 Completed: {title}\n{BANNER}\n\n"
+        )
+        return
+
+    sys.stdout.write(f"\n{BANNER}\n📱 Processing: {title}\n{BANNER}\n\n")
+    sys.stdout.flush()
+
+    # Load credentials before any platform starts. The publishers are
+    # imported lazily and run concurrently, so none of them can be relied
+    # on to load .env for the others.
+    load_dotenv()
+
+    # Collect each platform's output and write it afterwards in one go so
+    # that concurrent platforms don't interleave on the console
+    output = []
+    failed = []
+    for name, result in asyncio.run(_publish_platforms(platforms)):
+        if isinstance(result, BaseException):
+            failed.append(name)
+            output.append(f"\n❌ {name} raised {type(result).__name__}: {result}\n")
+            traceback.print_exception(type(result), result, result.__traceback__)
         else:
-            print(f"\n[DRY RUN] LinkedIn post:")
-            print(f"  {linkedin_config['content'][:200]}...")
-    
-    print(f"\n{'='*50}")
-    print(f"📱 Completed: {post.get('title', 'Untitled')}")
-    print(f"{'='*50}\n")
+            output.extend(f"{line}\n" for line in result)
+    sys.stdout.write(
+        f"{''.join(output)}\n{BANNER}\n📱 Completed: {title}\n{BANNER}\n\n"
+    )
+
+    if failed:
+        print(f"❌ Publishing raised an error on: {', '.join(failed)}")
+        sys.exit(1)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Publish social media post")
-    parser.add_argument('file', help='Path to post YAML file')
-    parser.add_argument('--prod', action='store_true', 
-                       help='Actually post (default is dry run)')
-    
+    parser.add_argument("file", help="Path to post YAML file")
+    parser.add_argument(
+        "--prod", action="store_true", help="Actually post (default is dry run)"
+    )
+
     args = parser.parse_args()
-    
+
     if not Path(args.file).exists():
         print(f"❌ File not found: {args.file}")
         sys.exit(1)
-    
+
     if args.prod:
         print("⚠️  PRODUCTION MODE - Posts will be published!")
-        confirm = input("Type 'yes' to confirm: ")
-        if confirm.lower() != 'yes':
-            print("Cancelled.")
-            sys.exit(0)
+        # In CI the PR approval is the confirmation, and there is no
+        # terminal to answer a prompt anyway
+        if sys.stdin.isatty() and not os.getenv("CI"):
+            confirm = input("Type 'yes' to confirm: ")
+            if confirm.lower() != "yes":
+                print("Cancelled.")
+                sys.exit(0)
+        else:
+            print("Non-interactive: skipping confirmation")
     else:
         print("🔍 DRY RUN MODE - No posts will be published\n")
-    
+
     publish_post(args.file, prod=args.prod)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
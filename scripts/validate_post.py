@@ -1,59 +1,72 @@
 #!/usr/bin/env python3
 """Validate a social media post YAML file."""
 
+import argparse
 import sys
-import yaml
 from pathlib import Path
 
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from policyengine_social.yaml_utils import load_post, save_parsed  # noqa: E402
+
+VALID_X_ACCOUNTS = frozenset({"thepolicyengine", "policyengineus", "policyengineuk"})
+MAX_TWEET_LENGTH = 280
+
+
+def validate_post(filepath, cache=False):
+    """Validate a post YAML file.
+
+    Args:
+        filepath: Path to post YAML file
+        cache: If True, save the parsed post so publish_post.py can skip
+            parsing it again.
+    """
+    post = load_post(filepath)
 
-def validate_post(filepath):
-    """Validate a post YAML file."""
-    with open(filepath, 'r') as f:
-        post = yaml.safe_load(f)
-    
     errors = []
-    
+
     # Check required fields
-    required = ['title', 'platforms']
+    required = ["title", "platforms"]
     for field in required:
         if field not in post:
             errors.append(f"Missing required field: {field}")
-    
+
     # Validate platforms
-    if 'platforms' in post:
-        if 'x' in post['platforms']:
-            x_config = post['platforms']['x']
-            
+    if "platforms" in post:
+        if "x" in post["platforms"]:
+            x_config = post["platforms"]["x"]
+
             # Check accounts
-            if 'accounts' not in x_config:
+            if "accounts" not in x_config:
                 errors.append("X platform missing 'accounts' field")
             else:
-                valid_accounts = ['thepolicyengine', 'policyengineus', 'policyengineuk']
-                for account in x_config['accounts']:
-                    if account not in valid_accounts:
-                        errors.append(f"Invalid X account: {account}")
-            
+                errors.extend(
+                    f"Invalid X account: {account}"
+                    for account in x_config["accounts"]
+                    if account not in VALID_X_ACCOUNTS
+                )
+
             # Check content
-            if 'thread' not in x_config and 'post' not in x_config:
+            if "thread" not in x_config and "post" not in x_config:
                 errors.append("X platform needs either 'thread' or 'post' field")
-            
+
             # Check tweet length
-            if 'thread' in x_config:
-                for i, tweet in enumerate(x_config['thread']):
-                    length = len(tweet)
-                    if length > 280:
-                        errors.append(f"Tweet {i+1} is too long: {length} chars")
+            if "thread" in x_config:
+                for i, length in enumerate(map(len, x_config["thread"]), 1):
+                    if length > MAX_TWEET_LENGTH:
+                        errors.append(f"Tweet {i} is too long: {length} chars")
                     else:
-                        print(f"  ✓ Tweet {i+1}: {length}/280 chars")
-            
-            if 'post' in x_config and len(x_config['post']) > 280:
+                        print(f"  ✓ Tweet {i}: {length}/{MAX_TWEET_LENGTH} chars")
+
+            if "post" in x_config and len(x_config["post"]) > MAX_TWEET_LENGTH:
                 errors.append(f"Post is too long: {len(x_config['post'])} chars")
-        
-        if 'linkedin' in post['platforms']:
-            linkedin_config = post['platforms']['linkedin']
-            if 'content' not in linkedin_config:
+
+        if "linkedin" in post["platforms"]:
+            linkedin_config = post["platforms"]["linkedin"]
+            if "content" not in linkedin_config:
                 errors.append("LinkedIn platform missing 'content' field")
-    
+
     # Report results
     if errors:
         print(f"❌ Validation failed for {filepath}:")
@@ -62,12 +75,21 @@ def validate_post(filepath):
         sys.exit(1)
     else:
         print(f"✅ {filepath} is valid")
+        if cache:
+            save_parsed(filepath, post)
         return True
 
 
+def main():
+    parser = argparse.ArgumentParser(description="Validate social media post")
+    parser.add_argument("file", help="Path to post YAML file")
+    parser.add_argument(
+        "--cache", action="store_true", help="Save the parsed post for publish_post.py"
+    )
+
+    args = parser.parse_args()
+    validate_post(args.file, cache=args.cache)
+
+
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python validate_post.py <post.yaml>")
-        sys.exit(1)
-    
-    validate_post(sys.argv[1])
\ No newline at end of file
+    main()
@@ -4,14 +4,34 @@ PolicyEngine Social Media Automation
 Automated social media posting for PolicyEngine blog articles.
 """
 
-__version__ = "0.1.0"
+import importlib
 
-from .extract import BlogImageExtractor
-from .generate import SocialPostGenerator
-from .publish import XPublisher
+__version__ = "0.1.0"
 
 __all__ = [
     "BlogImageExtractor",
     "SocialPostGenerator",
     "XPublisher",
 ]
+
+# Public classes and the submodules defining them. They are imported on
+# first access (PEP 562) so that importing the package doesn't pull in
+# tweepy, Pillow and requests up front.
+_LAZY_IMPORTS = {
+    "BlogImageExtractor": ".extract",
+    "SocialPostGenerator": ".generate",
+    "XPublisher": ".publish",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        module = importlib.import_module(_LAZY_IMPORTS[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
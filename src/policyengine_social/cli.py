@@ -2,15 +2,23 @@
 """CLI for PolicyEngine social media posting."""
 
 import argparse
-import yaml
-from .publishers.x_multi import MultiAccountXPublisher
-from .generate import SocialPostGenerator
-from .extract import BlogImageExtractor
+import functools
+import sys
+
+from .yaml_utils import safe_dump
+
+
+@functools.lru_cache(maxsize=None)
+def _x_publisher(config_path=None):
+    """Return a shared X publisher for the given config path."""
+    from .publishers.x_multi import MultiAccountXPublisher
+
+    return MultiAccountXPublisher(config_path)
 
 
 def post_to_x(args):
     """Post to X accounts."""
-    publisher = MultiAccountXPublisher(args.config)
+    publisher = _x_publisher(args.config)
 
     if args.thread:
         # Read thread from file or stdin
@@ -42,6 +50,8 @@ def post_to_x(args):
 
 def generate_posts(args):
     """Generate social media posts from blog content."""
+    from .generate import SocialPostGenerator
+
     generator = SocialPostGenerator(args.url or args.file)
 
     if args.platform == "x":
@@ -63,12 +73,14 @@ def generate_posts(args):
             "source": args.url or args.file,
         }
         with open(args.output, "w") as f:
-            yaml.dump(output, f)
+            safe_dump(output, f)
         print("\n💾 Saved to: {args.output}")
 
 
 def extract_images(args):
     """Extract images from blog post."""
+    from .extract import BlogImageExtractor
+
     extractor = BlogImageExtractor(args.url or args.file)
     images = extractor.extract_images()
 
@@ -81,13 +93,8 @@ def extract_images(args):
                 print("    Downloaded to: {path}")
 
 
-def main():
-    """Main CLI entry point."""
-    parser = argparse.ArgumentParser(description="PolicyEngine social media automation")
-
-    subparsers = parser.add_subparsers(dest="command", help="Commands")
-
-    # Post to X command
+def _add_post_x_parser(subparsers):
+    """Add the post-x command."""
     post_x = subparsers.add_parser("post-x", help="Post to X (Twitter)")
     post_x.add_argument("text", nargs="?", help="Text to post")
     post_x.add_argument(
@@ -102,7 +109,9 @@ def main():
     post_x.add_argument("--images", "-i", nargs="+", help="Image paths to attach")
     post_x.add_argument("--config", "-c", help="Config file path")
 
-    # Generate posts command
+
+def _add_generate_parser(subparsers):
+    """Add the generate command."""
     gen = subparsers.add_parser("generate", help="Generate posts from blog")
     gen.add_argument("--url", "-u", help="Blog post URL")
     gen.add_argument("--file", "-", help="Blog post file")
@@ -116,7 +125,9 @@ def main():
     gen.add_argument("--max-posts", type=int, default=10, help="Max posts in thread")
     gen.add_argument("--output", "-o", help="Save to file")
 
-    # Extract images command
+
+def _add_extract_parser(subparsers):
+    """Add the extract command."""
     extract = subparsers.add_parser("extract", help="Extract images from blog")
     extract.add_argument("--url", "-u", help="Blog post URL")
     extract.add_argument("--file", "-", help="Blog post file")
@@ -124,13 +135,47 @@ def main():
         "--download", "-d", action="store_true", help="Download images"
     )
 
-    # Batch post command
+
+def _add_batch_parser(subparsers):
+    """Add the batch command."""
     batch = subparsers.add_parser("batch", help="Post to all accounts")
     batch.add_argument("text", help="Text to post")
     batch.add_argument("--exclude", "-e", nargs="+", help="Accounts to exclude")
     batch.add_argument("--config", "-c", help="Config file path")
 
-    args = parser.parse_args()
+
+# Subcommand parser builders, in the order they appear in --help
+COMMAND_PARSERS = {
+    "post-x": _add_post_x_parser,
+    "generate": _add_generate_parser,
+    "extract": _add_extract_parser,
+    "batch": _add_batch_parser,
+}
+
+
+def main(argv=None):
+    """Main CLI entry point.
+
+    Args:
+        argv: Command line arguments, defaulting to ``sys.argv[1:]``
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    parser = argparse.ArgumentParser(description="PolicyEngine social media automation")
+
+    subparsers = parser.add_subparsers(dest="command", help="Commands")
+
+    # Only build the requested command's parser. Top-level help, no
+    # command or an unknown command still get the full set.
+    command = argv[0] if argv else None
+    if command in COMMAND_PARSERS:
+        COMMAND_PARSERS[command](subparsers)
+    else:
+        for add_parser in COMMAND_PARSERS.values():
+            add_parser(subparsers)
+
+    args = parser.parse_args(argv)
 
     if not args.command:
         parser.print_help()
@@ -146,7 +191,7 @@ def main():
         extract_images(args)
         return 0
     elif args.command == "batch":
-        publisher = MultiAccountXPublisher(args.config)
+        publisher = _x_publisher(args.config)
         results = publisher.post_to_all(args.text, exclude=args.exclude)
         success = all(r["success"] for r in results.values())
 
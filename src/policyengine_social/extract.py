@@ -3,13 +3,111 @@
 Extract and process images from PolicyEngine blog posts.
 """
 
+import atexit
+import functools
+import hashlib
+import io
 import re
-import requests
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict
-import yaml
-from PIL import Image
-import subprocess
+from typing import Dict, List
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from .yaml_utils import safe_dump
+
+# Shared by every extractor and download thread, so connections to
+# raw.githubusercontent.com stay alive and are reused across fetches.
+# Everything fetched here is a GET, so flaky responses are safe to retry.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=8,
+        pool_maxsize=16,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    ),
+)
+
+# Images are written to disk as they arrive, this many bytes at a time
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Bounding box and JPEG quality for each platform's images
+PLATFORM_IMAGE_SPECS = {
+    "x": ((1200, 675), 85),  # X/Twitter: Max 5MB, prefer 16:9 for in-stream
+    "linkedin": ((1200, 627), 90),  # LinkedIn: 1200x627 for best results
+}
+
+# Sources at or under this size that already fit a platform's box are
+# copied as-is instead of being re-encoded (X's limit is 5MB)
+MAX_PASSTHROUGH_BYTES = 5 * 1024 * 1024
+
+# Markdown images, ![alt](url), and HTML <img> tags in article source
+_MD_IMG_RE = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+_HTML_IMG_RE = re.compile(r'<img[^>]+src="([^"]+)"[^>]*>')
+
+
+@functools.lru_cache(maxsize=4)
+def _get_posts_json(app_repo: str) -> List[Dict]:
+    """Fetch posts.json once per process; it doesn't change during a run."""
+    response = _SESSION.get(f"{app_repo}/src/posts/posts.json")
+    # Raise rather than return, so a failed fetch isn't cached
+    response.raise_for_status()
+    return response.json()
+
+
+@functools.lru_cache(maxsize=32)
+def _get_blog_markdown(app_repo: str, slug: str) -> str:
+    """Fetch an article's markdown once per process."""
+    response = _SESSION.get(f"{app_repo}/src/posts/articles/{slug}.md")
+    # Raise rather than return, so an error page isn't cached as the article
+    response.raise_for_status()
+    return response.text
+
+
+def clear_fetch_cache():
+    """Forget fetched posts.json and article contents."""
+    _get_posts_json.cache_clear()
+    _get_blog_markdown.cache_clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _browser():
+    """Launch headless Chromium once and reuse it for every screenshot."""
+    from playwright.sync_api import sync_playwright
+
+    playwright = sync_playwright().start()
+    try:
+        browser = playwright.chromium.launch()
+    except Exception:
+        # Usually Chromium isn't installed. Nothing is cached on failure,
+        # so stop the driver rather than leaking one per screenshot.
+        playwright.stop()
+        raise
+
+    def close():
+        browser.close()
+        playwright.stop()
+
+    atexit.register(close)
+    return browser
+
+
+def _fits(img, size, source: bytes) -> bool:
+    """Check whether an opened image can be used as-is within a bounding box."""
+    return (
+        img.width <= size[0]
+        and img.height <= size[1]
+        and len(source) <= MAX_PASSTHROUGH_BYTES
+    )
+
+
+def _hash_source(source: bytes):
+    """Hash an image's bytes for keying its optimized outputs."""
+    return hashlib.blake2b(source, digest_size=16)
 
 
 class BlogImageExtractor:
@@ -25,8 +123,14 @@ class BlogImageExtractor:
         """Extract all images from a blog post."""
         images = {}
 
+        # posts.json and the article are independent, so fetch them together
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            posts_future = executor.submit(self._fetch_posts_json)
+            markdown_future = executor.submit(self._fetch_blog_markdown)
+            posts_json = posts_future.result()
+            markdown_content = markdown_future.result()
+
         # 1. Get cover image from posts.json
-        posts_json = self._fetch_posts_json()
         for post in posts_json:
             if post["filename"].replace(".md", "") == self.slug:
                 cover_image = post.get("image")
@@ -41,47 +145,49 @@ class BlogImageExtractor:
                 break
 
         # 2. Parse markdown for inline images
-        markdown_content = self._fetch_blog_markdown()
-
         # Find all markdown images: ![alt](url)
-        md_images = re.findall(r"!\[([^\]]*)\]\(([^)]+)\)", markdown_content)
-        for i, (alt_text, img_path) in enumerate(md_images, 1):
-            images[f"inline_{i}"] = {
-                "id": f"inline_{i}",
-                "filename": Path(img_path).name,
-                "url": self._resolve_image_url(img_path),
-                "alt": alt_text or f"Image {i} from article",
-                "type": "supporting",
+        md_images = _MD_IMG_RE.findall(markdown_content)
+        images.update(
+            {
+                f"inline_{i}": {
+                    "id": f"inline_{i}",
+                    "filename": img_path.rsplit("/", 1)[-1],
+                    "url": self._resolve_image_url(img_path),
+                    "alt": alt_text or f"Image {i} from article",
+                    "type": "supporting",
+                }
+                for i, (alt_text, img_path) in enumerate(md_images, 1)
             }
+        )
 
         # 3. Find any HTML images
-        html_images = re.findall(r'<img[^>]+src="([^"]+)"[^>]*>', markdown_content)
-        for i, img_src in enumerate(html_images, 1):
-            images[f"html_{i}"] = {
-                "id": f"html_{i}",
-                "filename": Path(img_src).name,
-                "url": self._resolve_image_url(img_src),
-                "alt": f"Embedded image {i}",
-                "type": "embedded",
+        html_images = _HTML_IMG_RE.findall(markdown_content)
+        images.update(
+            {
+                f"html_{i}": {
+                    "id": f"html_{i}",
+                    "filename": img_src.rsplit("/", 1)[-1],
+                    "url": self._resolve_image_url(img_src),
+                    "alt": f"Embedded image {i}",
+                    "type": "embedded",
+                }
+                for i, img_src in enumerate(html_images, 1)
             }
+        )
 
         return images
 
     def _fetch_posts_json(self) -> List[Dict]:
         """Fetch posts.json from the app repo."""
-        url = f"{self.app_repo}/src/posts/posts.json"
-        response = requests.get(url)
-        return response.json()
+        return _get_posts_json(self.app_repo)
 
     def _fetch_blog_markdown(self) -> str:
         """Fetch the blog post markdown."""
-        url = f"{self.app_repo}/src/posts/articles/{self.slug}.md"
-        response = requests.get(url)
-        return response.text
+        return _get_blog_markdown(self.app_repo, self.slug)
 
     def _resolve_image_url(self, path: str) -> str:
         """Resolve relative image paths to full URLs."""
-        if path.startswith("http"):
+        if path.startswith(("http://", "https://")):
             return path
         if path.startswith("/"):
             return f"{self.app_repo}{path}"
@@ -92,58 +198,186 @@ class BlogImageExtractor:
         cache_path = self.cache_dir / image_info["filename"]
 
         if not cache_path.exists():
-            response = requests.get(image_info["url"])
-            if response.status_code == 200:
-                cache_path.write_bytes(response.content)
-                print(f"✓ Downloaded: {image_info['filename']}")
-            else:
-                print(f"✗ Failed to download: {image_info['url']}")
-                return None
+            with _SESSION.get(image_info["url"], stream=True) as response:
+                if response.status_code != 200:
+                    print(f"✗ Failed to download: {image_info['url']}")
+                    return None
+
+                # Stream into a partial file and only then move it into
+                # place, so an interrupted download is never reused. Each
+                # download gets its own partial file, since download_images
+                # may fetch the same filename twice at once.
+                with tempfile.NamedTemporaryFile(
+                    dir=self.cache_dir,
+                    prefix=cache_path.name,
+                    suffix=".part",
+                    delete=False,
+                ) as f:
+                    partial_path = Path(f.name)
+                    try:
+                        for chunk in response.iter_content(
+                            chunk_size=DOWNLOAD_CHUNK_SIZE
+                        ):
+                            f.write(chunk)
+                    except BaseException:
+                        f.close()
+                        partial_path.unlink()
+                        raise
+                partial_path.replace(cache_path)
+            print(f"✓ Downloaded: {image_info['filename']}")
         else:
             print(f"↺ Using cached: {image_info['filename']}")
 
         return cache_path
 
+    def download_images(self, images: Dict, max_workers: int = 8) -> Dict[str, Path]:
+        """Download and cache several images concurrently.
+
+        Args:
+            images: Image info dicts keyed by image ID, as from extract_images
+            max_workers: Maximum number of simultaneous downloads
+
+        Returns:
+            Local paths keyed by image ID, for the images that downloaded
+        """
+        paths = {}
+        if not images:
+            return paths
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(images))) as executor:
+            futures = {
+                executor.submit(self.download_image, info): img_id
+                for img_id, info in images.items()
+            }
+            for future in as_completed(futures):
+                path = future.result()
+                if path:
+                    paths[futures[future]] = path
+
+        return paths
+
     def optimize_for_platform(self, image_path: Path, platform: str) -> Path:
         """Optimize image for specific platform requirements."""
-        img = Image.open(image_path)
-        optimized_dir = Path("assets/optimized") / platform
-        optimized_dir.mkdir(parents=True, exist_ok=True)
+        source = image_path.read_bytes()
+        output_path = self._optimized_path(image_path, platform, _hash_source(source))
+        if output_path.exists():
+            print(f"↺ Using cached: {output_path}")
+            return output_path
 
-        output_path = optimized_dir / image_path.name
+        from PIL import Image
 
-        if platform == "x":
-            # X/Twitter: Max 5MB, prefer 16:9 for in-stream
-            img.thumbnail((1200, 675), Image.Resampling.LANCZOS)
-            img.save(output_path, optimize=True, quality=85)
+        img = Image.open(io.BytesIO(source))
 
-        elif platform == "linkedin":
-            # LinkedIn: 1200x627 for best results
-            img.thumbnail((1200, 627), Image.Resampling.LANCZOS)
-            img.save(output_path, optimize=True, quality=90)
+        if platform in PLATFORM_IMAGE_SPECS:
+            size, quality = PLATFORM_IMAGE_SPECS[platform]
+            if _fits(img, size, source):
+                output_path.write_bytes(source)
+                print(f"✓ Already fits {platform}: {output_path}")
+                return output_path
+
+            # Let JPEGs decode straight at a reduced scale, then box-reduce
+            # to about 3x the target before the LANCZOS pass
+            img.draft("RGB", size)
+            img.thumbnail(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+            img.save(output_path, optimize=True, quality=quality)
 
         print(f"⚡ Optimized for {platform}: {output_path}")
         return output_path
 
+    def optimize_for_platforms(
+        self, image_path: Path, platforms: List[str]
+    ) -> Dict[str, Path]:
+        """Optimize one image for several platforms at once.
+
+        The source is decoded and LANCZOS-downscaled once, to the smallest
+        box that covers every platform. Each platform's image is then a
+        small, cheap resize of that shared result.
+
+        Args:
+            image_path: Path to the source image
+            platforms: Platforms to optimize for, e.g. ["x", "linkedin"]
+
+        Returns:
+            Optimized image paths keyed by platform
+        """
+        specs = {
+            p: PLATFORM_IMAGE_SPECS[p] for p in platforms if p in PLATFORM_IMAGE_SPECS
+        }
+        if not specs:
+            return {}
+
+        source = image_path.read_bytes()
+        source_hash = _hash_source(source)
+        paths = {
+            platform: self._optimized_path(image_path, platform, source_hash)
+            for platform in specs
+        }
+
+        # Skip the decode entirely if every variant was already made
+        specs = {p: spec for p, spec in specs.items() if not paths[p].exists()}
+        if not specs:
+            print(f"↺ Using cached: {', '.join(map(str, paths.values()))}")
+            return paths
+
+        from PIL import Image
+
+        img = Image.open(io.BytesIO(source))
+
+        # Images that already fit a platform are copied, not re-encoded
+        for platform, (size, _) in list(specs.items()):
+            if _fits(img, size, source):
+                paths[platform].write_bytes(source)
+                print(f"✓ Already fits {platform}: {paths[platform]}")
+                del specs[platform]
+        if not specs:
+            return paths
+
+        box = (
+            max(size[0] for size, _ in specs.values()),
+            max(size[1] for size, _ in specs.values()),
+        )
+        img.draft("RGB", box)
+        img.thumbnail(box, Image.Resampling.LANCZOS, reducing_gap=3.0)
+
+        for platform, (size, quality) in specs.items():
+            output_path = paths[platform]
+            variant = img.copy()
+            variant.thumbnail(size, Image.Resampling.LANCZOS)
+            variant.save(output_path, optimize=True, quality=quality)
+
+            print(f"⚡ Optimized for {platform}: {output_path}")
+
+        return paths
+
+    def _optimized_path(self, image_path: Path, platform: str, source_hash) -> Path:
+        """Output path for an image optimized for a platform.
+
+        Names are keyed by the source content and the platform's target
+        spec, so a changed source or spec never reuses a stale output.
+        """
+        digest = source_hash.copy()
+        digest.update(repr(PLATFORM_IMAGE_SPECS.get(platform)).encode())
+
+        optimized_dir = Path("assets/optimized") / platform
+        optimized_dir.mkdir(parents=True, exist_ok=True)
+        return optimized_dir / f"{digest.hexdigest()}-{image_path.name}"
+
     def capture_screenshot(self, url: str, output_name: str) -> Path:
         """Capture screenshot of a webpage (requires playwright)."""
         output_path = self.cache_dir / f"{output_name}.png"
 
-        # Using playwright CLI (install: pip install playwright && playwright install)
-        cmd = [
-            "playwright",
-            "screenshot",
-            "--wait-for-timeout=3000",
-            "--viewport-size=1200,630",
-            url,
-            str(output_path),
-        ]
-
+        # Requires: pip install playwright && playwright install chromium
         try:
-            subprocess.run(cmd, check=True, capture_output=True)
+            page = _browser().new_page(viewport={"width": 1200, "height": 630})
+            try:
+                page.goto(url)
+                page.wait_for_timeout(3000)
+                page.screenshot(path=str(output_path))
+            finally:
+                page.close()
             print(f"📸 Captured screenshot: {output_name}")
             return output_path
-        except subprocess.CalledProcessError as e:
+        except Exception as e:
             print(f"✗ Screenshot failed: {e}")
             return None
 
@@ -182,7 +416,10 @@ def main():
         "--download", action="store_true", help="Download images locally"
     )
     parser.add_argument(
-        "--optimize", choices=["x", "linkedin"], help="Optimize for platform"
+        "--optimize",
+        nargs="+",
+        choices=["x", "linkedin"],
+        help="Optimize for one or more platforms",
     )
     parser.add_argument("--screenshot", help="URL to screenshot")
 
@@ -196,15 +433,14 @@ def main():
         print(f"  - {img_id}: {info['filename']} ({info['type']})")
 
     if args.download:
-        for img_info in images.values():
-            extractor.download_image(img_info)
+        extractor.download_images(images)
 
     if args.optimize and images:
         # Optimize cover image for platform
         if "cover" in images:
             cover_path = extractor.download_image(images["cover"])
             if cover_path:
-                extractor.optimize_for_platform(cover_path, args.optimize)
+                extractor.optimize_for_platforms(cover_path, args.optimize)
 
     if args.screenshot:
         extractor.capture_screenshot(args.screenshot, f"{args.slug}-screenshot")
@@ -213,7 +449,7 @@ def main():
     manifest_path = Path(f"posts/queue/{args.slug}-images.yaml")
     manifest_path.parent.mkdir(parents=True, exist_ok=True)
     with open(manifest_path, "w") as f:
-        yaml.dump({"images": images}, f)
+        safe_dump({"images": images}, f)
     print(f"\n✅ Saved image manifest: {manifest_path}")
 
 
@@ -4,11 +4,12 @@ Generate social media posts from PolicyEngine blog articles.
 """
 
 import argparse
-import yaml
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List
 
+from .yaml_utils import safe_dump
+
 
 class SocialPostGenerator:
     def __init__(self, slug: str, title: str = None):
@@ -145,7 +146,7 @@ def main():
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     with open(output_path, "w") as f:
-        yaml.dump(post_data, f, default_flow_style=False, sort_keys=False)
+        safe_dump(post_data, f, default_flow_style=False, sort_keys=False)
 
     print(f"✅ Generated social post: {output_path}")
 
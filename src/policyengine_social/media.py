@@ -0,0 +1,38 @@
+"""Helpers for image files attached to posts."""
+
+import functools
+import mimetypes
+import os
+from typing import NamedTuple, Optional
+
+
+class ImageMeta(NamedTuple):
+    """File metadata for an image attachment."""
+
+    name: str
+    mime_type: Optional[str]
+    size: int
+
+
+@functools.lru_cache(maxsize=256)
+def _stat_image(path: str) -> ImageMeta:
+    mime_type, _ = mimetypes.guess_type(path)
+    return ImageMeta(os.path.basename(path), mime_type, os.stat(path).st_size)
+
+
+def image_meta(path) -> Optional[ImageMeta]:
+    """Look up an image's file name, MIME type and size.
+
+    Results are cached by path, so an image attached to several posts or
+    accounts is only stat'd once. Missing files are not cached.
+
+    Args:
+        path: Path to the image
+
+    Returns:
+        Image metadata, or None if the file doesn't exist
+    """
+    try:
+        return _stat_image(os.fspath(path))
+    except OSError:
+        return None
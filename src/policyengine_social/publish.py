@@ -4,16 +4,20 @@ Publish posts to X (Twitter).
 """
 
 import os
-import yaml
-import tweepy
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import time
-from typing import List, Dict
+from pathlib import Path
+from typing import Dict, List
+
+from .ratelimit import MinIntervalLimiter
+from .yaml_utils import load_post, safe_dump
 
 
 class XPublisher:
     def __init__(self):
+        # Imported here so loading this module (e.g. for --help) stays fast
+        import tweepy
+
         # Initialize X API client
         self.client = tweepy.Client(
             consumer_key=os.environ.get("X_API_KEY"),
@@ -31,33 +35,40 @@ class XPublisher:
         )
         self.api = tweepy.API(auth)
 
+        # Keeps tweets in a thread at least 2 seconds apart
+        self._pacer = MinIntervalLimiter(2)
+
     def publish_thread(self, thread: List[str], media_files: List[str] = None) -> str:
-        """Publish a thread to X."""
+        """Publish a thread to X.
+
+        Media for the first tweet starts uploading in the background right
+        away and is only waited for just before that tweet is sent.
+        """
         tweet_ids = []
 
-        for i, tweet_text in enumerate(thread):
-            # Add media only to first tweet
-            media_ids = None
-            if i == 0 and media_files:
-                media_ids = self.upload_media(media_files)
-
-            # Post tweet
-            if i == 0:
-                # First tweet in thread
-                response = self.client.create_tweet(
-                    text=tweet_text, media_ids=media_ids
-                )
-            else:
-                # Reply to previous tweet
-                response = self.client.create_tweet(
-                    text=tweet_text, in_reply_to_tweet_id=tweet_ids[-1]
-                )
-
-            tweet_ids.append(response.data["id"])
-
-            # Small delay between tweets to avoid rate limits
-            if i < len(thread) - 1:
-                time.sleep(2)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            media_future = None
+            if media_files:
+                media_future = executor.submit(self.upload_media, media_files)
+
+            for i, tweet_text in enumerate(thread):
+                # Space tweets out to avoid rate limits
+                self._pacer.wait()
+
+                # Post tweet
+                if i == 0:
+                    # First tweet in thread, with any media
+                    media_ids = media_future.result() if media_future else None
+                    response = self.client.create_tweet(
+                        text=tweet_text, media_ids=media_ids
+                    )
+                else:
+                    # Reply to previous tweet
+                    response = self.client.create_tweet(
+                        text=tweet_text, in_reply_to_tweet_id=tweet_ids[-1]
+                    )
+
+                tweet_ids.append(response.data["id"])
 
         return tweet_ids[0]  # Return first tweet ID
 
@@ -119,10 +130,21 @@ def main():
     queue_dir = Path("posts/queue")
     publisher = XPublisher()
 
-    for post_file in queue_dir.glob("*.yaml"):
-        with open(post_file, "r") as f:
-            post_data = yaml.safe_load(f)
+    if not queue_dir.is_dir():
+        return
+
+    with os.scandir(queue_dir) as entries:
+        post_files = [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".yaml") and entry.is_file()
+        ]
+
+    # Parse the whole queue up front, a few files at a time
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        queued = list(executor.map(load_post, post_files))
 
+    for post_file, post_data in zip(post_files, queued):
         # Check if it's time to publish
         publish_at = datetime.fromisoformat(post_data.get("publish_at", ""))
         if datetime.now() >= publish_at:
@@ -131,7 +153,7 @@ def main():
             if publisher.publish_post(post_data):
                 # Update and save the post data
                 with open(post_file, "w") as f:
-                    yaml.dump(post_data, f, default_flow_style=False)
+                    safe_dump(post_data, f, default_flow_style=False)
 
                 # Move to published folder
                 published_path = Path("posts/published") / post_file.name
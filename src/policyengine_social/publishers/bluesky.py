@@ -1,20 +1,66 @@
 """Bluesky publisher for PolicyEngine social media posts."""
 
-import os
+import hashlib
 import logging
-from typing import Dict, List, Optional
-from atproto import Client, client_utils
+import os
+import random
+import re
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from dotenv import load_dotenv
+
+from policyengine_social.media import image_meta
+from policyengine_social.ratelimit import retry_after
 
 logger = logging.getLogger(__name__)
 
+POST_COLLECTION = "app.bsky.feed.post"
+
+# at://<repo>/<collection>/<rkey>
+_AT_URI_RE = re.compile(r"^at://([^/]+)/([^/]+)/([^/]+)$")
+
+# Most reposts sent to Bluesky at the same time by one publisher
+MAX_CONCURRENT_REPOSTS = 4
+
+# Uploaded image blobs remembered per account, so a header image used across
+# a campaign is read and uploaded once
+MAX_CACHED_BLOBS = 32
+
+# Record keys are timestamp identifiers (TIDs): microseconds since the epoch
+# and a random clock id, written in atproto's sortable base32 alphabet.
+_TID_ALPHABET = "234567abcdefghijklmnopqrstuvwxyz"
+_TID_CLOCK_ID = random.randrange(1024)
+_tid_lock = threading.Lock()
+_last_tid_micros = 0
+
+
+def _next_tid() -> str:
+    """Generate a new, strictly increasing record key."""
+    global _last_tid_micros
+    with _tid_lock:
+        micros = max(time.time_ns() // 1000, _last_tid_micros + 1)
+        _last_tid_micros = micros
+    value = (micros << 10) | _TID_CLOCK_ID
+    return "".join(_TID_ALPHABET[(value >> shift) & 31] for shift in range(60, -1, -5))
+
+
+def _record_cid(record: Dict) -> str:
+    """Compute the CID a PDS assigns to a record (CIDv1, dag-cbor, sha2-256)."""
+    import libipld
+
+    digest = hashlib.sha256(libipld.encode_dag_cbor(record)).digest()
+    return libipld.encode_cid(b"\x01\x71\x12\x20" + digest)
+
 
 class BlueSkyPublisher:
     """Publisher for Bluesky social network."""
-    
+
     def __init__(self, handle: str = None, password: str = None):
         """Initialize Bluesky publisher.
-        
+
         Args:
             handle: Bluesky handle (e.g., "policyengine.bsky.social")
             password: App password for the account
@@ -22,12 +68,16 @@ class BlueSkyPublisher:
         self.handle = handle or os.getenv("BLUESKY_HANDLE")
         self.password = password or os.getenv("BLUESKY_PASSWORD")
         self.client = None
-        
+        self._blobs = {}
+        self._blobs_lock = threading.Lock()
+
         if self.handle and self.password:
             self.login()
-    
+
     def login(self):
         """Login to Bluesky."""
+        from atproto import Client
+
         try:
             self.client = Client()
             self.client.login(self.handle, self.password)
@@ -35,7 +85,7 @@ class BlueSkyPublisher:
         except Exception as e:
             logger.error(f"Failed to login to Bluesky: {e}")
             raise
-    
+
     def post(
         self,
         text: str,
@@ -43,194 +93,353 @@ class BlueSkyPublisher:
         reply_to: Optional[str] = None,
     ) -> Dict:
         """Post to Bluesky.
-        
+
         Args:
             text: Post text (max 300 characters)
             images: Optional list of image paths
             reply_to: Optional post URI to reply to
-            
+
         Returns:
             Response dict with post details
         """
         if not self.client:
             return {"success": False, "error": "Not logged in"}
-        
+
         try:
             # Check text length
             if len(text) > 300:
-                logger.warning(f"Text too long for Bluesky ({len(text)} chars), truncating")
+                logger.warning(
+                    f"Text too long for Bluesky ({len(text)} chars), truncating"
+                )
                 text = text[:297] + "..."
-            
+
             # Build the post
+            from atproto import client_utils
+
             post_builder = client_utils.TextBuilder()
             post_builder.text(text)
-            
+
             # Handle images if provided
             embed = None
             if images:
-                image_alts = []
+                # Bluesky supports up to 4 images
+                found = [(path, image_meta(path)) for path in images[:4]]
+                found = [(path, meta) for path, meta in found if meta]
+                paths = [path for path, _ in found]
+                image_alts = [meta.name for _, meta in found]
+
+                # Upload images concurrently; map() keeps them in order
                 uploaded_images = []
-                
-                for img_path in images[:4]:  # Bluesky supports up to 4 images
-                    if os.path.exists(img_path):
-                        with open(img_path, 'rb') as f:
-                            img_data = f.read()
-                        
-                        # Upload image
-                        upload = self.client.upload_blob(img_data)
-                        uploaded_images.append(upload.blob)
-                        image_alts.append(os.path.basename(img_path))
-                
+                if paths:
+                    with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+                        uploaded_images = list(executor.map(self._upload_image, paths))
+
                 if uploaded_images:
                     embed = {
                         "$type": "app.bsky.embed.images",
                         "images": [
                             {"alt": alt, "image": img.to_dict()}
                             for alt, img in zip(image_alts, uploaded_images)
-                        ]
+                        ],
                     }
-            
-            # Create the post
-            post_data = {
-                "text": post_builder.build_text(),
-                "facets": post_builder.build_facets(),
-            }
-            
+
+            # Create the post; send_post builds the text and facets once
+            post_data = {"text": post_builder}
+
             if embed:
                 post_data["embed"] = embed
-            
+
             if reply_to:
-                # Parse reply reference
-                post_data["reply"] = {
-                    "parent": {"uri": reply_to},
-                    "root": {"uri": reply_to}  # Simplified - should track root
-                }
-            
+                from atproto import models
+
+                parent = models.ComAtprotoRepoStrongRef.Main(
+                    uri=reply_to, cid=self.get_cid(reply_to)
+                )
+                post_data["reply_to"] = models.AppBskyFeedPost.ReplyRef(
+                    parent=parent, root=parent  # Simplified - should track root
+                )
+
             # Send the post
             response = self.client.send_post(**post_data)
-            
+
             logger.info(f"Posted to Bluesky: {response.uri}")
-            
+
             return {
                 "success": True,
                 "uri": response.uri,
                 "cid": response.cid,
-                "url": f"https://bsky.app/profile/{self.handle}/post/{response.uri.split('/')[-1]}"
+                "url": f"https://bsky.app/profile/{self.handle}/post/{response.uri.split('/')[-1]}",
             }
-            
+
         except Exception as e:
             logger.error(f"Error posting to Bluesky: {e}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
-    
+            return {"success": False, "error": str(e), "retry_after": retry_after(e)}
+
+    def _upload_image(self, path: str):
+        """Upload an image file, reusing the blob from an earlier upload.
+
+        Blobs are keyed by the file's real path, modification time and size,
+        so an edited image is uploaded again.
+
+        Args:
+            path: Path to the image
+
+        Returns:
+            Blob reference for the uploaded image
+        """
+        stat = os.stat(path)
+        key = (os.path.realpath(path), stat.st_mtime_ns, stat.st_size)
+        blob = self._blobs.get(key)
+        if blob is None:
+            with open(path, "rb") as f:
+                blob = self.client.upload_blob(f.read()).blob
+            with self._blobs_lock:
+                if len(self._blobs) >= MAX_CACHED_BLOBS:
+                    self._blobs.pop(next(iter(self._blobs)))
+                self._blobs[key] = blob
+        return blob
+
     def post_thread(
         self,
         posts: List[str],
         images: Optional[List[str]] = None,
     ) -> Dict:
         """Post a thread to Bluesky.
-        
+
+        The first post (which carries any images) is created normally.
+        The replies only need its URI and CID, and their own CIDs can be
+        computed locally, so they are all written in a single applyWrites
+        request instead of one request per post.
+
         Args:
             posts: List of post texts
             images: Optional images for first post
-            
+
         Returns:
             Response dict with thread info
         """
         if not self.client:
             return {"success": False, "error": "Not logged in"}
-        
+
         results = []
-        previous_uri = None
-        root_uri = None
-        
-        for i, text in enumerate(posts):
-            # Only add images to first post
-            post_images = images if i == 0 else None
-            
-            result = self.post(
-                text=text,
-                images=post_images,
-                reply_to=previous_uri
-            )
-            
-            if result["success"]:
-                if i == 0:
-                    root_uri = result["uri"]
-                previous_uri = result["uri"]
-                results.append(result)
-            else:
-                logger.error(f"Thread interrupted at post {i+1}")
-                break
-            
-            # Small delay between posts
-            if i < len(posts) - 1:
-                time.sleep(1)
-        
-        return {
+        first = self.post(text=posts[0], images=images) if posts else None
+        if first and first["success"]:
+            results.append(first)
+            if len(posts) > 1:
+                results.extend(self._post_replies(posts[1:], first))
+        elif posts:
+            logger.error("Thread interrupted at post 1")
+
+        thread = {
             "success": len(results) == len(posts),
             "posts": results,
-            "thread_url": results[0]["url"] if results else None
+            "thread_url": results[0]["url"] if results else None,
         }
-    
-    def repost(self, uri: str) -> Dict:
+        # Surface why the thread stopped, so callers can report and retry it
+        if first and not first["success"]:
+            thread["error"] = first.get("error")
+            thread["retry_after"] = first.get("retry_after")
+        elif not thread["success"]:
+            thread["error"] = f"Thread interrupted at post {len(results) + 1}"
+        return thread
+
+    def _post_replies(self, posts: List[str], root: Dict) -> List[Dict]:
+        """Write a chain of replies to ``root`` in one applyWrites call.
+
+        If the server stores a reply under a different CID than the one
+        computed here, the replies after it would point at a wrong parent,
+        so they are deleted and sent again one at a time.
+
+        Args:
+            posts: Texts of the replies, in thread order
+            root: Result of posting the thread's first post
+
+        Returns:
+            List of result dicts for the replies, empty on failure
+        """
+        from atproto import models
+
+        root_ref = models.ComAtprotoRepoStrongRef.Main(uri=root["uri"], cid=root["cid"])
+        parent_ref = root_ref
+        did = self.client.me.did
+        writes = []
+        expected = []
+        texts = []
+
+        for text in posts:
+            if len(text) > 300:
+                logger.warning(
+                    f"Text too long for Bluesky ({len(text)} chars), truncating"
+                )
+                text = text[:297] + "..."
+            texts.append(text)
+
+            record = models.AppBskyFeedPost.Record(
+                created_at=self.client.get_current_time_iso(),
+                text=text,
+                langs=["en"],
+                reply=models.AppBskyFeedPost.ReplyRef(root=root_ref, parent=parent_ref),
+            )
+            rkey = _next_tid()
+            cid = _record_cid(models.get_model_as_dict(record))
+            uri = f"at://{did}/{POST_COLLECTION}/{rkey}"
+
+            writes.append(
+                models.ComAtprotoRepoApplyWrites.Create(
+                    collection=POST_COLLECTION, rkey=rkey, value=record
+                )
+            )
+            expected.append((uri, cid))
+            parent_ref = models.ComAtprotoRepoStrongRef.Main(uri=uri, cid=cid)
+
+        try:
+            response = self.client.com.atproto.repo.apply_writes(
+                models.ComAtprotoRepoApplyWrites.Data(repo=did, writes=writes)
+            )
+        except Exception as e:
+            logger.error(f"Error posting thread replies to Bluesky: {e}")
+            logger.error("Thread interrupted at post 2")
+            return []
+
+        created = getattr(response, "results", None) or []
+        posted = expected
+        for i, ((uri, cid), result) in enumerate(zip(expected, created)):
+            stored = getattr(result, "cid", cid)
+            if stored != cid:
+                # Every later reply names this one as its parent with the
+                # wrong CID, so replace them with replies sent one by one
+                logger.warning(
+                    f"Bluesky stored {uri} with CID {stored}, expected {cid}; "
+                    f"re-posting the rest of the thread one by one"
+                )
+                posted = expected[:i] + [(uri, stored)]
+                posted += self._resend_replies(
+                    texts[i + 1 :], writes[i + 1 :], root_ref, posted[-1], i + 2
+                )
+                break
+        else:
+            logger.info(f"Posted {len(writes)} thread replies to Bluesky")
+
+        profile_url = f"https://bsky.app/profile/{self.handle}/post"
+        return [
+            {
+                "success": True,
+                "uri": uri,
+                "cid": cid,
+                "url": f"{profile_url}/{uri.split('/')[-1]}",
+            }
+            for uri, cid in posted
+        ]
+
+    def _resend_replies(self, texts, stale_writes, root_ref, parent, position):
+        """Replace replies written with a wrong parent CID by sequential posts.
+
+        Args:
+            texts: Texts of the replies to post again, in thread order
+            stale_writes: The applyWrites creates that wrote them the first time
+            root_ref: Strong reference to the thread's first post
+            parent: (URI, CID) of the last correctly stored reply
+            position: Thread position of the first reply in ``texts``
+
+        Returns:
+            List of (URI, CID) pairs for the replies that were posted
+        """
+        from atproto import models
+
+        if not texts:
+            return []
+
+        try:
+            self.client.com.atproto.repo.apply_writes(
+                models.ComAtprotoRepoApplyWrites.Data(
+                    repo=self.client.me.did,
+                    writes=[
+                        models.ComAtprotoRepoApplyWrites.Delete(
+                            collection=write.collection, rkey=write.rkey
+                        )
+                        for write in stale_writes
+                    ],
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error removing mis-linked thread replies from Bluesky: {e}")
+            logger.error(f"Thread interrupted at post {position}")
+            return []
+
+        posted = []
+        for text in texts:
+            parent_ref = models.ComAtprotoRepoStrongRef.Main(
+                uri=parent[0], cid=parent[1]
+            )
+            try:
+                response = self.client.send_post(
+                    text=text,
+                    reply_to=models.AppBskyFeedPost.ReplyRef(
+                        root=root_ref, parent=parent_ref
+                    ),
+                    langs=["en"],
+                )
+            except Exception as e:
+                logger.error(f"Error posting thread reply to Bluesky: {e}")
+                logger.error(f"Thread interrupted at post {position + len(posted)}")
+                break
+            parent = (response.uri, response.cid)
+            posted.append(parent)
+
+        return posted
+
+    def get_cid(self, uri: str) -> str:
+        """Look up the CID of a post.
+
+        Args:
+            uri: AT URI of the post
+
+        Returns:
+            CID of the post's current version
+        """
+        repo, _, rkey = _AT_URI_RE.match(uri).groups()
+        return self.client.get_post(rkey, repo).cid
+
+    def repost(self, uri: str, cid: Optional[str] = None) -> Dict:
         """Repost another post.
-        
+
         Args:
             uri: AT URI of the post to repost
-            
+            cid: CID of the post, looked up if not given
+
         Returns:
             Dict with success status and repost info
         """
         try:
-            # Parse the URI to get the necessary components
             # URI format: at://did:plc:xxxxx/app.bsky.feed.post/xxxxx
-            parts = uri.replace("at://", "").split("/")
-            if len(parts) < 3:
+            if not _AT_URI_RE.match(uri):
                 return {"success": False, "error": "Invalid URI format"}
-            
-            repo = parts[0]
-            collection = parts[1]
-            rkey = parts[2]
-            
-            # Create the repost
-            repost_record = {
-                "$type": "app.bsky.feed.repost",
-                "subject": {
-                    "uri": uri,
-                    "cid": None  # CID would be fetched from the original post
-                },
-                "createdAt": self.client.get_current_time_iso()
-            }
-            
-            response = self.client.send_post(
-                text="",  # Reposts don't have text
-                reply_to=None,
-                embed=repost_record
-            )
-            
+
+            if cid is None:
+                cid = self.get_cid(uri)
+
+            response = self.client.repost(uri=uri, cid=cid)
+
             logger.info(f"Successfully reposted: {uri}")
-            return {
-                "success": True,
-                "uri": response.uri,
-                "reposted_uri": uri
-            }
-            
+            return {"success": True, "uri": response.uri, "reposted_uri": uri}
+
         except Exception as e:
             logger.error(f"Error reposting: {e}")
-            return {"success": False, "error": str(e)}
+            return {"success": False, "error": str(e), "retry_after": retry_after(e)}
 
 
 class MultiAccountBlueSkyPublisher:
     """Manage multiple Bluesky accounts for PolicyEngine."""
-    
+
     def __init__(self):
         """Initialize multi-account Bluesky publisher."""
         self.accounts = {}
-        
-        # Load credentials from environment
+        self._repost_slots = threading.Semaphore(MAX_CONCURRENT_REPOSTS)
+        self._cids = {}  # AT URI -> CID of posts reposted so far
+
+        # Load credentials from environment, including .env, so this
+        # doesn't depend on another publisher having loaded it first
+        load_dotenv()
         account_configs = {
             "policyengine": {
                 "handle": os.getenv("BLUESKY_POLICYENGINE_HANDLE"),
@@ -243,61 +452,113 @@ class MultiAccountBlueSkyPublisher:
             "policyengineuk": {
                 "handle": os.getenv("BLUESKY_POLICYENGINEUK_HANDLE"),
                 "password": os.getenv("BLUESKY_POLICYENGINEUK_PASSWORD"),
-            }
+            },
+        }
+
+        # Initialize accounts that have credentials, logging in to all
+        # of them at once rather than one round trip after another
+        configured = {
+            name: config
+            for name, config in account_configs.items()
+            if config["handle"] and config["password"]
         }
-        
-        # Initialize accounts that have credentials
-        for name, config in account_configs.items():
-            if config["handle"] and config["password"]:
-                try:
-                    self.accounts[name] = BlueSkyPublisher(
-                        handle=config["handle"],
-                        password=config["password"]
-                    )
-                    logger.info(f"Initialized Bluesky account: {name}")
-                except Exception as e:
-                    logger.warning(f"Failed to initialize Bluesky {name}: {e}")
-    
+        if not configured:
+            return
+
+        with ThreadPoolExecutor(max_workers=len(configured)) as executor:
+            futures = {
+                name: executor.submit(
+                    BlueSkyPublisher,
+                    handle=config["handle"],
+                    password=config["password"],
+                )
+                for name, config in configured.items()
+            }
+
+        for name, future in futures.items():
+            try:
+                self.accounts[name] = future.result()
+                logger.info(f"Initialized Bluesky account: {name}")
+            except Exception as e:
+                logger.warning(f"Failed to initialize Bluesky {name}: {e}")
+
     def post(self, text: str, account: str = "policyengine", **kwargs) -> Dict:
         """Post to a specific Bluesky account."""
         if account not in self.accounts:
             return {"success": False, "error": f"Account {account} not configured"}
-        
+
         return self.accounts[account].post(text, **kwargs)
-    
-    def post_thread(self, posts: List[str], account: str = "policyengine", **kwargs) -> Dict:
+
+    def post_thread(
+        self, posts: List[str], account: str = "policyengine", **kwargs
+    ) -> Dict:
         """Post a thread to a specific Bluesky account."""
         if account not in self.accounts:
             return {"success": False, "error": f"Account {account} not configured"}
-        
+
         return self.accounts[account].post_thread(posts, **kwargs)
-    
+
     def repost(self, uri: str, from_account: str, to_accounts: List[str]) -> Dict:
         """Repost from one account to other accounts.
-        
+
+        Reposts from different accounts are independent, so they are
+        sent concurrently, with at most MAX_CONCURRENT_REPOSTS in flight
+        across all calls.
+
         Args:
             uri: AT URI of the post to repost
             from_account: Account that posted the original
             to_accounts: List of accounts that should repost
-            
+
         Returns:
             Dict of results by account
         """
-        results = {}
-        
-        for account in to_accounts:
-            if account not in self.accounts:
-                results[account] = {
-                    "success": False,
-                    "error": f"Account {account} not configured"
-                }
-                continue
-            
-            result = self.accounts[account].repost(uri)
-            result["from_account"] = from_account
-            results[account] = result
-            
-            # Small delay between reposts
-            time.sleep(1)
-        
-        return results
\ No newline at end of file
+        if not to_accounts:
+            return {}
+
+        # Every account reposts the same version, so look its CID up once
+        cid = self._resolve_cid(uri, from_account)
+
+        with ThreadPoolExecutor(max_workers=len(to_accounts)) as executor:
+            futures = {
+                account: executor.submit(
+                    self._repost_one, uri, cid, from_account, account
+                )
+                for account in to_accounts
+            }
+            return {account: future.result() for account, future in futures.items()}
+
+    def _resolve_cid(self, uri: str, from_account: str) -> Optional[str]:
+        """Look up and remember a post's CID, or None if it can't be found.
+
+        Reposting accounts look the CID up themselves if this fails.
+        """
+        if uri in self._cids:
+            return self._cids[uri]
+
+        publisher = self.accounts.get(from_account)
+        if publisher is None:
+            publisher = next(iter(self.accounts.values()), None)
+        if publisher is None or not _AT_URI_RE.match(uri):
+            return None
+
+        try:
+            cid = publisher.get_cid(uri)
+        except Exception as e:
+            logger.warning(f"Failed to look up CID for {uri}: {e}")
+            return None
+
+        self._cids[uri] = cid
+        return cid
+
+    def _repost_one(
+        self, uri: str, cid: Optional[str], from_account: str, account: str
+    ) -> Dict:
+        """Repost a post from a single account."""
+        if account not in self.accounts:
+            return {"success": False, "error": f"Account {account} not configured"}
+
+        with self._repost_slots:
+            result = self.accounts[account].repost(uri, cid)
+        result["from_account"] = from_account
+        return result
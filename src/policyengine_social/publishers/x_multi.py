@@ -1,21 +1,52 @@
 """Multi-account X (Twitter) publisher for PolicyEngine."""
 
-import os
-import yaml
-import tweepy
 import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Literal
-import time
+from typing import Dict, List, Literal, Optional
+
+import requests
+import tweepy
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-# Load environment variables
-load_dotenv()
+from policyengine_social.media import image_meta
+from policyengine_social.ratelimit import MinIntervalLimiter, retry_after
+from policyengine_social.yaml_utils import load_post
 
 logger = logging.getLogger(__name__)
 
 AccountName = Literal["thepolicyengine", "policyengineus", "policyengineuk"]
 
+# Mentions of each country in post text, for routing to its account
+_US_TERMS_RE = re.compile(r"united states|u\.s\.| us |america", re.IGNORECASE)
+_UK_TERMS_RE = re.compile(r"united kingdom|u\.k\.| uk |britain", re.IGNORECASE)
+
+
+def _pooled_session() -> requests.Session:
+    """Create a session that reuses TLS connections to the X API.
+
+    Retries cover connection failures and idempotent requests only; a
+    retried POST could publish the same tweet twice.
+    """
+    session = requests.Session()
+    session.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=[429, 500, 502, 503, 504],
+            ),
+        ),
+    )
+    return session
+
 
 class MultiAccountXPublisher:
     """Manages posting to multiple PolicyEngine X accounts."""
@@ -39,22 +70,34 @@ class MultiAccountXPublisher:
                     / "x_accounts.yaml"
                 )
 
-            with open(config_path, "r") as f:
-                self.config = yaml.safe_load(f)
+            # Parsed with libyaml if available, and only re-parsed if the
+            # file has changed since the last publisher was created
+            self.config = load_post(config_path)
 
         self.clients = {}
         self.apis = {}  # For media upload (v1.1 API)
 
+        # Keeps each account's thread posts apart without blocking others
+        self._thread_pacer = MinIntervalLimiter(
+            self.config["settings"]["thread_delay_seconds"]
+        )
+
         # Initialize clients for each account
         for account_name, creds in self.config["accounts"].items():
-            self.clients[account_name] = tweepy.Client(
+            client = tweepy.Client(
                 consumer_key=creds["api_key"],
                 consumer_secret=creds["api_secret"],
                 access_token=creds["access_token"],
                 access_token_secret=creds["access_token_secret"],
             )
-
-            # Also create v1.1 API client for media uploads
+            # tweepy has no session argument, so swap in a pooled one. Each
+            # account gets its own, so cookies set for one account are
+            # never sent with another's requests.
+            client.session = _pooled_session()
+            self.clients[account_name] = client
+
+            # Also create v1.1 API client for media uploads. It closes its
+            # session after every request, so it keeps its own.
             auth = tweepy.OAuth1UserHandler(
                 creds["api_key"],
                 creds["api_secret"],
@@ -65,6 +108,10 @@ class MultiAccountXPublisher:
 
     def _load_from_env(self) -> Dict:
         """Load configuration from environment variables."""
+        # Read .env only when credentials come from the environment, rather
+        # than on every import of this module
+        load_dotenv()
+
         config = {
             "accounts": {},
             "settings": {
@@ -156,7 +203,12 @@ class MultiAccountXPublisher:
 
         except Exception as e:
             logger.error(f"Error posting to @{account}: {e}")
-            return {"success": False, "account": account, "error": str(e)}
+            return {
+                "success": False,
+                "account": account,
+                "error": str(e),
+                "retry_after": retry_after(e),
+            }
 
     def post_thread(
         self,
@@ -179,11 +231,15 @@ class MultiAccountXPublisher:
 
         results = []
         previous_id = None
+        failure: Dict = {}
 
         for i, text in enumerate(posts):
             # Only add images to first post
             post_images = images if i == 0 else None
 
+            # Space posts out, per account, to avoid rate limits
+            self._thread_pacer.wait(account)
+
             result = self.post(
                 text=text, account=account, images=post_images, reply_to=previous_id
             )
@@ -193,18 +249,20 @@ class MultiAccountXPublisher:
                 results.append(result)
             else:
                 logger.error(f"Thread interrupted at post {i+1}")
+                failure = result
                 break
 
-            # Delay between posts
-            if i < len(posts) - 1:
-                time.sleep(self.config["settings"]["thread_delay_seconds"])
-
-        return {
+        thread = {
             "success": len(results) == len(posts),
             "account": account,
             "posts": results,
             "thread_url": results[0]["url"] if results else None,
         }
+        # Surface why the thread stopped, so callers can report and retry it
+        if failure:
+            thread["error"] = failure.get("error")
+            thread["retry_after"] = failure.get("retry_after")
+        return thread
 
     def post_to_all(
         self,
@@ -218,16 +276,23 @@ class MultiAccountXPublisher:
             exclude: Optional list of accounts to skip
 
         Returns:
-            Dict of results by account
+            Dict of results by account, in completion order
         """
         exclude = exclude or []
+        accounts = [a for a in self.config["accounts"] if a not in exclude]
         results = {}
 
-        for account in self.config["accounts"].keys():
-            if account not in exclude:
-                results[account] = self.post(text=text, account=account)
-                # Small delay between accounts
-                time.sleep(1)
+        if not accounts:
+            return results
+
+        # Each account has its own client and rate limit, so post concurrently
+        with ThreadPoolExecutor(max_workers=len(accounts)) as executor:
+            futures = {
+                executor.submit(self.post, text=text, account=account): account
+                for account in accounts
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
 
         return results
 
@@ -238,49 +303,52 @@ class MultiAccountXPublisher:
         to_accounts: List[AccountName],
     ) -> Dict:
         """Repost a post from one account to other accounts.
-        
+
+        Reposts from different accounts are independent, so they are
+        sent concurrently.
+
         Args:
             tweet_id: ID of the tweet to repost
             from_account: Account that posted the original tweet
             to_accounts: List of accounts that should repost
-            
+
         Returns:
             Dict of results by account
         """
-        results = {}
-        
-        for account in to_accounts:
-            if account not in self.clients:
-                results[account] = {
-                    "success": False, 
-                    "error": f"Account {account} not configured"
-                }
-                continue
-                
-            try:
-                client = self.clients[account]
-                # Repost using the X API (called retweet in the API)
-                response = client.retweet(tweet_id)
-                results[account] = {
-                    "success": True,
-                    "account": account,
-                    "reposted_id": tweet_id,
-                    "from_account": from_account,
-                }
-                logger.info(f"@{account} reposted {tweet_id} from @{from_account}")
-                
-                # Small delay between reposts
-                time.sleep(1)
-                
-            except Exception as e:
-                logger.error(f"Error reposting from @{account}: {e}")
-                results[account] = {
-                    "success": False,
-                    "account": account,
-                    "error": str(e)
-                }
-                
-        return results
+        if not to_accounts:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=len(to_accounts)) as executor:
+            futures = {
+                account: executor.submit(
+                    self._repost_one, tweet_id, from_account, account
+                )
+                for account in to_accounts
+            }
+            return {account: future.result() for account, future in futures.items()}
+
+    def _repost_one(
+        self, tweet_id: str, from_account: AccountName, account: AccountName
+    ) -> Dict:
+        """Repost a tweet from a single account."""
+        if account not in self.clients:
+            return {"success": False, "error": f"Account {account} not configured"}
+
+        try:
+            client = self.clients[account]
+            # Repost using the X API (called retweet in the API)
+            client.retweet(tweet_id)
+            logger.info(f"@{account} reposted {tweet_id} from @{from_account}")
+            return {
+                "success": True,
+                "account": account,
+                "reposted_id": tweet_id,
+                "from_account": from_account,
+            }
+
+        except Exception as e:
+            logger.error(f"Error reposting from @{account}: {e}")
+            return {"success": False, "account": account, "error": str(e)}
 
     def route_by_content(
         self,
@@ -311,15 +379,10 @@ class MultiAccountXPublisher:
                 if tag in routing["by_tag"]:
                     return routing["by_tag"][tag]
 
-        # Check content for country mentions
-        text_lower = text.lower()
-        if any(
-            term in text_lower for term in ["united states", "u.s.", " us ", "america"]
-        ):
+        # Check content for country mentions, US first
+        if _US_TERMS_RE.search(text):
             return "policyengineus"
-        elif any(
-            term in text_lower for term in ["united kingdom", "u.k.", " uk ", "britain"]
-        ):
+        elif _UK_TERMS_RE.search(text):
             return "policyengineuk"
 
         # Default
@@ -336,12 +399,16 @@ class MultiAccountXPublisher:
             List of media IDs
         """
         api = self.apis[account]
-        media_ids = []
+        paths = [path for path in image_paths if image_meta(path)]
+        if not paths:
+            return None
+
+        # Uploads are independent, so send them together; map keeps the
+        # media IDs in the same order as the images
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            media = list(executor.map(api.media_upload, paths))
 
-        for path in image_paths:
-            if os.path.exists(path):
-                media = api.media_upload(path)
-                media_ids.append(media.media_id_string)
-                logger.info(f"Uploaded media for @{account}: {path}")
+        for path in paths:
+            logger.info(f"Uploaded media for @{account}: {path}")
 
-        return media_ids if media_ids else None
+        return [m.media_id_string for m in media]
@@ -1,22 +1,102 @@
 """Zapier webhook integration for cross-platform posting."""
 
+import json
 import logging
-from typing import Dict, List, Optional, Any
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
 import requests
+from requests.adapters import HTTPAdapter
+
+from policyengine_social.ratelimit import retry_after
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 logger = logging.getLogger(__name__)
 
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Responses that mean the webhook didn't run and may be retried
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    """Serialize a webhook payload, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload).encode("utf-8")
+
+
+def _loads(response: requests.Response) -> Any:
+    """Parse a webhook response body, treating an empty body as ``{}``."""
+    if not response.content:
+        return {}
+    if orjson is not None:
+        try:
+            return orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            pass  # Let requests raise its usual RequestException below
+    return response.json()
+
+
+def _is_retryable(error: requests.exceptions.RequestException) -> bool:
+    """Check whether a failed webhook call can be safely sent again.
+
+    Read timeouts are not retried, since Zapier may already have run the
+    Zap and a retry would post twice.
+    """
+    if isinstance(error, requests.exceptions.HTTPError):
+        response = error.response
+        return response is not None and response.status_code in RETRY_STATUSES
+    return isinstance(error, requests.exceptions.ConnectionError)
+
 
 class ZapierPublisher:
     """Publisher that uses Zapier webhooks for cross-platform posting."""
 
-    def __init__(self, webhook_url: str):
+    def __init__(
+        self,
+        webhook_url: str,
+        max_retries: int = 4,
+        backoff_base: float = 0.25,
+        backoff_cap: float = 30.0,
+    ):
         """Initialize Zapier publisher.
 
         Args:
             webhook_url: Zapier webhook catch URL
+            max_retries: Retries after the first attempt for transient errors
+            backoff_base: Upper bound in seconds of the first retry's delay
+            backoff_cap: Longest delay in seconds before any retry
         """
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be at least 0, got {max_retries}")
+
         self.webhook_url = webhook_url
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+
+        # Keep the connection to Zapier alive between webhook calls
+        self._session = requests.Session()
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=4, pool_maxsize=32)
+        )
+
+    def close(self):
+        """Close pooled connections to Zapier."""
+        self._session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
 
     def publish(
         self,
@@ -49,27 +129,7 @@ class ZapierPublisher:
             "metadata": metadata or {},
         }
 
-        try:
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=30,
-            )
-            response.raise_for_status()
-
-            logger.info("Successfully sent to Zapier webhook")
-            return {
-                "success": True,
-                "status_code": response.status_code,
-                "response": response.json() if response.text else {},
-            }
-
-        except requests.exceptions.RequestException as e:
-            logger.error("Failed to send to Zapier: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-            }
+        return self._send(payload, "post")
 
     def publish_thread(
         self,
@@ -94,24 +154,108 @@ class ZapierPublisher:
             "metadata": metadata or {},
         }
 
-        try:
-            response = requests.post(
-                self.webhook_url,
-                json=payload,
-                timeout=30,
-            )
-            response.raise_for_status()
-
-            logger.info("Successfully sent thread to Zapier webhook")
-            return {
-                "success": True,
-                "status_code": response.status_code,
-                "response": response.json() if response.text else {},
-            }
-
-        except requests.exceptions.RequestException as e:
-            logger.error("Failed to send thread to Zapier: {e}")
-            return {
-                "success": False,
-                "error": str(e),
-            }
+        return self._send(payload, "thread")
+
+    def publish_batch(
+        self,
+        items: List[Dict[str, Any]],
+        batch_key: str = "posts",
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Publish several posts in a single webhook call.
+
+        The Zap receiving the batch has to loop over the items itself,
+        e.g. with Zapier's Looping action.
+
+        Args:
+            items: Post payloads, as they would be sent one at a time
+            batch_key: Payload key holding the list of items
+            metadata: Optional additional metadata
+
+        Returns:
+            Response from Zapier webhook
+        """
+        payload = {
+            "type": "batch",
+            batch_key: items,
+            "metadata": metadata or {},
+        }
+
+        return self._send(payload, "batch")
+
+    def publish_many(
+        self, posts: List[Dict[str, Any]], max_workers: int = 8
+    ) -> List[Dict[str, Any]]:
+        """Publish several posts via the webhook concurrently.
+
+        Deliveries share the publisher's connection pool and are each
+        retried independently.
+
+        Args:
+            posts: Keyword arguments for publish(), one dict per post
+            max_workers: Most webhook calls in flight at once
+
+        Returns:
+            Results in the same order as posts
+        """
+        if not posts:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(posts))) as executor:
+            return list(executor.map(lambda post: self.publish(**post), posts))
+
+    def _send(self, payload: Dict[str, Any], kind: str) -> Dict[str, Any]:
+        """POST a payload to the webhook, retrying transient failures.
+
+        Retries wait a random time up to an exponentially growing bound
+        ("full jitter"), or as long as a Retry-After header asks, but
+        never longer than the backoff cap.
+
+        Args:
+            payload: JSON payload to send
+            kind: What is being sent, for log messages
+
+        Returns:
+            Result dict with success status and Zapier's response
+        """
+        data = _dumps(payload)
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self._session.post(
+                    self.webhook_url,
+                    data=data,
+                    headers=JSON_HEADERS,
+                    timeout=30,
+                )
+                response.raise_for_status()
+
+                logger.info("Successfully sent %s to Zapier webhook", kind)
+                return {
+                    "success": True,
+                    "status_code": response.status_code,
+                    "response": _loads(response),
+                }
+
+            except requests.exceptions.RequestException as e:
+                if attempt == self.max_retries or not _is_retryable(e):
+                    logger.error("Failed to send %s to Zapier: %s", kind, e)
+                    return {
+                        "success": False,
+                        "error": str(e),
+                    }
+
+                delay = retry_after(e)
+                if delay is None:
+                    delay = random.uniform(0, self.backoff_base * 2**attempt)
+                delay = min(delay, self.backoff_cap)
+                logger.warning(
+                    "Zapier %s attempt %d failed (%s), retrying in %.1fs",
+                    kind,
+                    attempt + 1,
+                    e,
+                    delay,
+                )
+                time.sleep(delay)
+
+        # The last attempt always returns, since max_retries is at least 0
+        raise AssertionError("unreachable")
@@ -0,0 +1,122 @@
+"""Rate limiting helpers for social media API calls."""
+
+import threading
+import time
+from typing import Dict, Hashable, Optional
+
+# Headers APIs use to say when a rate-limited request may be retried.
+# Retry-After is a number of seconds; the others are Unix timestamps.
+_RETRY_AFTER_HEADER = "retry-after"
+_RESET_HEADERS = ("x-rate-limit-reset", "ratelimit-reset")
+
+
+class TokenBucket:
+    """Thread-safe token bucket that only blocks once its tokens run out."""
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        """Initialize a full bucket.
+
+        Args:
+            capacity: Maximum number of tokens, i.e. the allowed burst size
+            refill_per_sec: Number of tokens added back per second
+        """
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = float(capacity)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, sleeping only if none are available.
+
+        Tokens are reserved under the lock and may go negative, so
+        concurrent callers queue up behind each other instead of all
+        waking at the same moment.
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(
+                self.capacity,
+                self.tokens + (now - self.last_refill) * self.refill_per_sec,
+            )
+            self.last_refill = now
+
+            wait = 0.0
+            if self.tokens < 1:
+                wait = (1 - self.tokens) / self.refill_per_sec
+            self.tokens -= 1
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class MinIntervalLimiter:
+    """Thread-safe pacer that keeps calls for each key an interval apart.
+
+    Each key (e.g. an account) remembers when its next call is allowed, so
+    only whatever is left of the interval is slept. Time already spent on
+    uploads or earlier requests counts towards it.
+    """
+
+    def __init__(self, interval: float):
+        """Initialize with no calls made yet.
+
+        Args:
+            interval: Minimum number of seconds between calls for a key
+        """
+        self.interval = interval
+        self._next_allowed: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, key: Hashable = None) -> float:
+        """Wait until the next call for ``key`` is allowed and reserve it.
+
+        Args:
+            key: What to pace calls for; calls for different keys don't wait
+                on each other
+
+        Returns:
+            Number of seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_allowed.get(key, now))
+            self._next_allowed[key] = start + self.interval
+
+        wait = start - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+def retry_after(error: Exception) -> Optional[float]:
+    """Read how long to wait before retrying from a failed request's headers.
+
+    Works with errors from tweepy and atproto, which both keep the HTTP
+    response on the exception.
+
+    Args:
+        error: Exception raised by an API call
+
+    Returns:
+        Seconds to wait, or None if the response doesn't say
+    """
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    headers = {key.lower(): value for key, value in headers.items()}
+
+    try:
+        if _RETRY_AFTER_HEADER in headers:
+            return max(0.0, float(headers[_RETRY_AFTER_HEADER]))
+        for header in _RESET_HEADERS:
+            if header in headers:
+                return max(0.0, float(headers[header]) - time.time())
+    except ValueError:
+        pass
+    return None
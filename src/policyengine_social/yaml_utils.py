@@ -0,0 +1,101 @@
+"""YAML helpers that use the libyaml C bindings when they are available."""
+
+import copy
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+import yaml
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
+# Parsed posts handed from validate_post.py to publish_post.py. Entries are
+# keyed by a hash of the YAML bytes and live outside the repository, so a
+# stale or committed cache file can never stand in for the reviewed YAML.
+PARSED_CACHE_DIR = Path(tempfile.gettempdir()) / "policyengine-social"
+
+
+def safe_load(stream):
+    """Parse YAML like ``yaml.safe_load``, but with the C loader if possible."""
+    return yaml.load(stream, Loader=SafeLoader)
+
+
+def safe_dump(data, stream=None, **kwargs):
+    """Serialize YAML like ``yaml.safe_dump``, but with the C dumper if possible."""
+    return yaml.dump(data, stream, Dumper=SafeDumper, **kwargs)
+
+
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(path: str, mtime_ns: int, size: int) -> Any:
+    with open(path, "rb") as f:
+        return safe_load(f)
+
+
+def load_post(path) -> Any:
+    """Load a YAML file, reusing the previous parse if the file is unchanged.
+
+    Parses are cached by path, modification time and size, so editing the
+    file always forces a fresh parse.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed contents, as a copy that the caller may modify
+    """
+    path = os.fspath(path)
+    stat = os.stat(path)
+    return copy.deepcopy(_load_yaml_cached(path, stat.st_mtime_ns, stat.st_size))
+
+
+def _parsed_cache_path(path) -> Path:
+    digest = hashlib.sha256(Path(path).read_bytes()).hexdigest()
+    return PARSED_CACHE_DIR / f"{digest}.json"
+
+
+def save_parsed(path, data: Any) -> Optional[Path]:
+    """Cache the parsed contents of a YAML file for a later process.
+
+    Args:
+        path: Path to the YAML file that was parsed
+        data: Parsed contents of the file
+
+    Returns:
+        Path of the cache entry, or None if the data is not JSON-serializable
+    """
+    try:
+        payload = json.dumps(data)
+    except TypeError:
+        return None
+
+    cache_path = _parsed_cache_path(path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(payload)
+    return cache_path
+
+
+def pop_parsed(path) -> Optional[Any]:
+    """Return and remove the cached parse of a YAML file, if there is one.
+
+    Args:
+        path: Path to the YAML file
+
+    Returns:
+        Parsed contents, or None if the file has not been cached as-is
+    """
+    cache_path = _parsed_cache_path(path)
+    try:
+        data = json.loads(cache_path.read_text())
+    except (OSError, ValueError):
+        return None
+
+    cache_path.unlink()
+    return data
@@ -3,43 +3,47 @@
 Run all tests for the PolicyEngine Social Media Automation system.
 """
 
-from tests.test_publish_to_x import TestXPublisher, TestPublishingSchedule
-from tests.test_generate_social_post import (
-    TestSocialPostGenerator,
-    TestContentVariations,
-    TestErrorHandling,
-)
-from tests.test_extract_blog_images import (
-    TestBlogImageExtractor,
-    TestImageIntegration,
-)
-import unittest
 import sys
+import unittest
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-# Import all test modules
+_LOADER = unittest.TestLoader()
 
 
 def create_test_suite():
     """Create and return a test suite with all tests."""
-    suite = unittest.TestSuite()
-
-    # Add image extraction tests
-    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestBlogImageExtractor))
-    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestImageIntegration))
-
-    # Add post generation tests
-    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSocialPostGenerator))
-    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestContentVariations))
-    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestErrorHandling))
-
-    # Add publishing tests
-    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestXPublisher))
-    suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestPublishingSchedule))
+    # Imported here rather than at module level so that pytest, which
+    # collects this file too, doesn't run every case a second time
+    from tests.test_extract_blog_images import (
+        TestBlogImageExtractor,
+        TestImageIntegration,
+    )
+    from tests.test_generate_social_post import (
+        TestContentVariations,
+        TestErrorHandling,
+        TestSocialPostGenerator,
+    )
+    from tests.test_publish_to_x import TestPublishingSchedule, TestXPublisher
+
+    cases = (
+        # Image extraction tests
+        TestBlogImageExtractor,
+        TestImageIntegration,
+        # Post generation tests
+        TestSocialPostGenerator,
+        TestContentVariations,
+        TestErrorHandling,
+        # Publishing tests
+        TestXPublisher,
+        TestPublishingSchedule,
+    )
 
+    suite = unittest.TestSuite()
+    for case in cases:
+        suite.addTests(_LOADER.loadTestsFromTestCase(case))
     return suite
 
 
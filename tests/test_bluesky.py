@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Tests for Bluesky publishing functionality.
+"""
+
+import os
+import tempfile
+import threading
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from policyengine_social.publishers.bluesky import (
+    BlueSkyPublisher,
+    MultiAccountBlueSkyPublisher,
+    _next_tid,
+    _record_cid,
+)
+
+ROOT_URI = "at://did:plc:test/app.bsky.feed.post/3kroot"
+ROOT_CID = "bafyreiax32t3heeoeaia4m5ggaa4o5jfzt5xf7gfpg4xg574lxxpwpe77q"
+
+
+def _make_publisher():
+    """Create a publisher with a mocked, logged-in client."""
+    with patch.object(BlueSkyPublisher, "login"):
+        publisher = BlueSkyPublisher("policyengine.bsky.social", "password")
+    publisher.client = MagicMock()
+    return publisher
+
+
+class TestBlueSkyThread(unittest.TestCase):
+    """Test cases for posting Bluesky threads."""
+
+    def setUp(self):
+        """Set up a publisher with a mocked, logged-in client."""
+        self.publisher = _make_publisher()
+        self.publisher.client.me.did = "did:plc:test"
+        self.publisher.client.get_current_time_iso.return_value = (
+            "2024-01-01T00:00:00.000Z"
+        )
+        self.publisher.client.send_post.return_value = MagicMock(
+            uri=ROOT_URI, cid=ROOT_CID
+        )
+
+    def test_replies_are_written_in_one_request(self):
+        """Every reply after the first post goes into a single applyWrites."""
+        result = self.publisher.post_thread(["First", "Second", "Third"])
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(result["posts"]), 3)
+        self.publisher.client.send_post.assert_called_once()
+        self.publisher.client.com.atproto.repo.apply_writes.assert_called_once()
+
+    def test_replies_chain_to_previous_post(self):
+        """Each reply points at the thread root and at the post before it."""
+        result = self.publisher.post_thread(["First", "Second", "Third"])
+
+        data = self.publisher.client.com.atproto.repo.apply_writes.call_args[0][0]
+        second, third = (write.value for write in data.writes)
+        self.assertEqual(second.reply.root.uri, ROOT_URI)
+        self.assertEqual(second.reply.parent.cid, ROOT_CID)
+        self.assertEqual(third.reply.root.cid, ROOT_CID)
+        self.assertEqual(third.reply.parent.uri, result["posts"][1]["uri"])
+        self.assertEqual(third.reply.parent.cid, result["posts"][1]["cid"])
+
+    def test_cid_mismatch_resends_later_replies(self):
+        """Replies after one stored with an unexpected CID are posted again."""
+        reply_uris = [f"{ROOT_URI}{i}" for i in (3, 4)]
+        self.publisher.client.send_post.side_effect = [
+            MagicMock(uri=ROOT_URI, cid=ROOT_CID),
+            MagicMock(uri=reply_uris[0], cid="bafythird"),
+            MagicMock(uri=reply_uris[1], cid="bafyfourth"),
+        ]
+        apply_writes = self.publisher.client.com.atproto.repo.apply_writes
+        apply_writes.return_value = SimpleNamespace(
+            results=[SimpleNamespace(cid="bafyserver"), SimpleNamespace(cid="x")]
+        )
+
+        result = self.publisher.post_thread(["First", "Second", "Third", "Fourth"])
+
+        self.assertTrue(result["success"])
+        second = result["posts"][1]
+        self.assertEqual(second["cid"], "bafyserver")
+        self.assertEqual([post["uri"] for post in result["posts"][2:]], reply_uris)
+
+        # The mis-linked replies are deleted...
+        created = apply_writes.call_args_list[0][0][0].writes
+        deleted = apply_writes.call_args_list[1][0][0].writes
+        self.assertEqual(
+            [write.rkey for write in deleted], [write.rkey for write in created[1:]]
+        )
+
+        # ...and re-sent in order, each replying to the post before it
+        third, fourth = self.publisher.client.send_post.call_args_list[1:]
+        self.assertEqual(third.kwargs["reply_to"].parent.uri, second["uri"])
+        self.assertEqual(third.kwargs["reply_to"].parent.cid, "bafyserver")
+        self.assertEqual(fourth.kwargs["reply_to"].parent.cid, "bafythird")
+        self.assertEqual(fourth.kwargs["reply_to"].root.cid, ROOT_CID)
+
+    def test_failed_first_post_stops_thread(self):
+        """If the first post fails, no replies are written."""
+        self.publisher.client.send_post.side_effect = Exception("boom")
+
+        result = self.publisher.post_thread(["First", "Second"])
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["posts"], [])
+        self.assertEqual(result["error"], "boom")
+        self.publisher.client.com.atproto.repo.apply_writes.assert_not_called()
+
+
+class TestBlueSkyPost(unittest.TestCase):
+    """Test cases for single Bluesky posts."""
+
+    def setUp(self):
+        """Set up a publisher with a mocked, logged-in client."""
+        self.publisher = _make_publisher()
+        self.publisher.client.send_post.return_value = MagicMock(
+            uri=ROOT_URI, cid=ROOT_CID
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up."""
+        self.tmp.cleanup()
+
+    def _image(self, name):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(name.encode())
+        return path
+
+    def _sent_embed(self, index=-1):
+        """Return the image embed of a send_post call, checking it is there."""
+        call = self.publisher.client.send_post.call_args_list[index]
+        embed = call.kwargs.get("embed")
+        self.assertIsNotNone(embed, "send_post called without an embed")
+        self.assertEqual(embed["$type"], "app.bsky.embed.images")
+        return embed
+
+    def test_images_upload_in_order(self):
+        """Each image is uploaded once and embedded in the original order."""
+        paths = [self._image(f"chart{i}.png") for i in range(1, 4)]
+        self.publisher.client.upload_blob.side_effect = lambda data: MagicMock(
+            blob=MagicMock(to_dict=MagicMock(return_value=data.decode()))
+        )
+
+        result = self.publisher.post("Text", images=paths)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.publisher.client.upload_blob.call_count, 3)
+        embed = self._sent_embed()
+        self.assertEqual(
+            [image["image"] for image in embed["images"]],
+            ["chart1.png", "chart2.png", "chart3.png"],
+        )
+        self.assertEqual(
+            [image["alt"] for image in embed["images"]],
+            ["chart1.png", "chart2.png", "chart3.png"],
+        )
+
+    def test_repeated_image_is_uploaded_once(self):
+        """An image used in several posts is only read and uploaded the first time."""
+        path = self._image("header.png")
+
+        self.publisher.post("First", images=[path])
+        self.publisher.post("Second", images=[path])
+
+        self.publisher.client.upload_blob.assert_called_once_with(b"header.png")
+        self.assertEqual(self._sent_embed(0), self._sent_embed(1))
+
+    def test_edited_image_is_uploaded_again(self):
+        """Changing an image file invalidates its cached blob."""
+        path = self._image("header.png")
+        self.publisher.post("First", images=[path])
+        with open(path, "wb") as f:
+            f.write(b"a new header image")
+
+        self.publisher.post("Second", images=[path])
+
+        self.assertEqual(self.publisher.client.upload_blob.call_count, 2)
+
+    def test_reply_references_parent(self):
+        """A reply is sent with a strong reference to the post it answers."""
+        self.publisher.client.get_post.return_value = MagicMock(cid=ROOT_CID)
+
+        result = self.publisher.post("Reply", reply_to=ROOT_URI)
+
+        self.assertTrue(result["success"])
+        reply = self.publisher.client.send_post.call_args.kwargs["reply_to"]
+        self.assertEqual(reply.parent.uri, ROOT_URI)
+        self.assertEqual(reply.parent.cid, ROOT_CID)
+
+    def test_missing_images_are_skipped(self):
+        """Paths that don't exist are not uploaded."""
+        paths = [self._image("chart.png"), os.path.join(self.tmp.name, "gone.png")]
+
+        self.publisher.post("Text", images=paths)
+
+        self.publisher.client.upload_blob.assert_called_once_with(b"chart.png")
+
+
+class TestBlueSkyRepost(unittest.TestCase):
+    """Test cases for reposting."""
+
+    def setUp(self):
+        """Set up a publisher with a mocked, logged-in client."""
+        self.publisher = _make_publisher()
+        self.publisher.client.get_post.return_value = MagicMock(cid=ROOT_CID)
+
+    def test_invalid_uri_is_rejected(self):
+        """URIs that aren't at://repo/collection/rkey are not reposted."""
+        for uri in ["did:plc:test/app.bsky.feed.post", "at://did:plc:test/post"]:
+            result = self.publisher.repost(uri)
+            self.assertEqual(result, {"success": False, "error": "Invalid URI format"})
+
+        self.publisher.client.repost.assert_not_called()
+
+    def test_valid_uri_is_reposted(self):
+        """A well-formed post URI is reposted with the CID it currently has."""
+        result = self.publisher.repost(ROOT_URI)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["reposted_uri"], ROOT_URI)
+        self.publisher.client.get_post.assert_called_once_with("3kroot", "did:plc:test")
+        self.publisher.client.repost.assert_called_once_with(uri=ROOT_URI, cid=ROOT_CID)
+
+    def test_known_cid_is_not_looked_up(self):
+        """A CID passed in is used as-is."""
+        self.publisher.repost(ROOT_URI, ROOT_CID)
+
+        self.publisher.client.get_post.assert_not_called()
+
+    def test_accounts_share_one_cid_lookup(self):
+        """Reposting to several accounts looks the CID up only once."""
+        with patch.object(MultiAccountBlueSkyPublisher, "__init__", return_value=None):
+            multi = MultiAccountBlueSkyPublisher()
+        multi.accounts = {"policyengine": self.publisher}
+        multi.accounts.update(
+            {name: MagicMock() for name in ["policyengineus", "policyengineuk"]}
+        )
+        multi._repost_slots = threading.Semaphore(2)
+        multi._cids = {}
+
+        others = ["policyengineus", "policyengineuk"]
+        results = multi.repost(ROOT_URI, "policyengine", others)
+        multi.repost(ROOT_URI, "policyengine", others)
+
+        self.assertEqual(set(results), set(others))
+        self.publisher.client.get_post.assert_called_once()
+        for name in others:
+            multi.accounts[name].repost.assert_called_with(ROOT_URI, ROOT_CID)
+
+
+class TestMultiAccountLogin(unittest.TestCase):
+    """Test cases for setting up several Bluesky accounts."""
+
+    @patch.dict(
+        os.environ,
+        {
+            "BLUESKY_POLICYENGINE_HANDLE": "policyengine.bsky.social",
+            "BLUESKY_POLICYENGINE_PASSWORD": "password",
+            "BLUESKY_POLICYENGINEUS_HANDLE": "policyengineus.bsky.social",
+            "BLUESKY_POLICYENGINEUS_PASSWORD": "password",
+        },
+        clear=True,
+    )
+    @patch("policyengine_social.publishers.bluesky.load_dotenv")
+    @patch.object(BlueSkyPublisher, "login")
+    def test_failed_login_skips_account(self, mock_login, mock_load_dotenv):
+        """Accounts that fail to log in are left out; the rest are kept."""
+        mock_login.side_effect = [None, Exception("bad password")]
+
+        publisher = MultiAccountBlueSkyPublisher()
+
+        self.assertEqual(mock_login.call_count, 2)
+        self.assertEqual(len(publisher.accounts), 1)
+
+    @patch.dict(os.environ, {}, clear=True)
+    @patch("policyengine_social.publishers.bluesky.load_dotenv")
+    @patch.object(BlueSkyPublisher, "login")
+    def test_credentials_are_read_from_dotenv(self, mock_login, mock_load_dotenv):
+        """Credentials only in .env are loaded before accounts are set up."""
+        mock_load_dotenv.side_effect = lambda: os.environ.update(
+            {
+                "BLUESKY_POLICYENGINEUK_HANDLE": "policyengineuk.bsky.social",
+                "BLUESKY_POLICYENGINEUK_PASSWORD": "password",
+            }
+        )
+
+        publisher = MultiAccountBlueSkyPublisher()
+
+        self.assertEqual(list(publisher.accounts), ["policyengineuk"])
+
+
+class TestRecordKeys(unittest.TestCase):
+    """Test cases for client-side record keys and CIDs."""
+
+    def test_tids_are_sortable(self):
+        """Record keys are 13 characters and increase in generation order."""
+        tids = [_next_tid() for _ in range(100)]
+
+        self.assertTrue(all(len(tid) == 13 for tid in tids))
+        self.assertEqual(tids, sorted(tids))
+        self.assertEqual(len(set(tids)), len(tids))
+
+    def test_record_cid(self):
+        """CIDs are dag-cbor CIDv1 strings that depend on the record content."""
+        record = {
+            "$type": "app.bsky.feed.post",
+            "text": "hi",
+            "createdAt": "2024-01-01T00:00:00.000Z",
+        }
+
+        self.assertEqual(_record_cid(record), ROOT_CID)
+        self.assertNotEqual(_record_cid({**record, "text": "bye"}), ROOT_CID)
+
+
+if __name__ == "__main__":
+    unittest.main()
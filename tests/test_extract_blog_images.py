@@ -5,32 +5,33 @@ TDD approach - write tests first, then make them pass.
 from unittest.mock import patch, MagicMock
 """
 
+import sys
+import tempfile
+import threading
 import unittest
-from unittest.mock import patch, MagicMock
 from pathlib import Path
-
-from policyengine_social.extract import BlogImageExtractor
-
-
-class TestBlogImageExtractor(unittest.TestCase):
-    """Test cases for BlogImageExtractor class."""
-
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_slug = "test-blog-post"
-        self.extractor = BlogImageExtractor(self.test_slug)
-
-        # Mock blog post data
-        self.mock_posts_json = [
-            {
-                "title": "Test Blog Post",
-                "filename": "test-blog-post.md",
-                "image": "test-cover.png",
-                "date": "2024-01-01",
-            }
-        ]
-
-        self.mock_markdown = """
+from unittest.mock import MagicMock, Mock, patch
+
+import requests
+from PIL import Image
+
+from policyengine_social.extract import (
+    BlogImageExtractor,
+    _browser,
+    clear_fetch_cache,
+)
+
+# Mock blog post data
+MOCK_POSTS_JSON = [
+    {
+        "title": "Test Blog Post",
+        "filename": "test-blog-post.md",
+        "image": "test-cover.png",
+        "date": "2024-01-01",
+    }
+]
+
+MOCK_MARKDOWN = """
 # Test Blog Post
 
 This is a test blog post with images.
@@ -46,14 +47,39 @@ Some more content here.
 And a final paragraph.
 """
 
-    @patch("policyengine_social.extract.requests.get")
-    def test_extract_cover_image(self, mock_get):
-        """Test extraction of cover image from posts.json."""
-        # Mock the API responses
-        mock_get.return_value.json.return_value = self.mock_posts_json
-        mock_get.return_value.text = self.mock_markdown
 
-        images = self.extractor.extract_images()
+def _blog_response(posts_json, markdown):
+    """Build a response that serves both posts.json and an article."""
+    response = Mock(spec=requests.Response)
+    response.json.return_value = posts_json
+    response.text = markdown
+    return response
+
+
+MOCK_RESPONSE = _blog_response(MOCK_POSTS_JSON, MOCK_MARKDOWN)
+
+
+class TestBlogImageExtractor(unittest.TestCase):
+    """Test cases for BlogImageExtractor class."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Extract the mock post's images once for the class."""
+        # The extraction tests only read the result, so they share one run
+        clear_fetch_cache()
+        with patch("policyengine_social.extract._SESSION.get") as mock_get:
+            mock_get.return_value = MOCK_RESPONSE
+            cls.images = BlogImageExtractor("test-blog-post").extract_images()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        clear_fetch_cache()
+        self.test_slug = "test-blog-post"
+        self.extractor = BlogImageExtractor(self.test_slug)
+
+    def test_extract_cover_image(self):
+        """Test extraction of cover image from posts.json."""
+        images = self.images
 
         # Assert cover image is extracted correctly
         self.assertIn("cover", images)
@@ -61,13 +87,9 @@ And a final paragraph.
         self.assertEqual(images["cover"]["type"], "hero")
         self.assertTrue(images["cover"]["url"].endswith("test-cover.png"))
 
-    @patch("policyengine_social.extract.requests.get")
-    def test_extract_markdown_images(self, mock_get):
+    def test_extract_markdown_images(self):
         """Test extraction of images from markdown content."""
-        mock_get.return_value.json.return_value = self.mock_posts_json
-        mock_get.return_value.text = self.mock_markdown
-
-        images = self.extractor.extract_images()
+        images = self.images
 
         # Should find 2 markdown images
         self.assertIn("inline_1", images)
@@ -80,80 +102,230 @@ And a final paragraph.
         # Check second markdown image (no alt text)
         self.assertEqual(images["inline_2"]["filename"], "inline-image.jpg")
 
-    @patch("policyengine_social.extract.requests.get")
-    def test_extract_html_images(self, mock_get):
+    def test_extract_html_images(self):
         """Test extraction of HTML img tags."""
-        mock_get.return_value.json.return_value = self.mock_posts_json
-        mock_get.return_value.text = self.mock_markdown
-
-        images = self.extractor.extract_images()
+        images = self.images
 
         # Should find 1 HTML image
         self.assertIn("html_1", images)
         self.assertEqual(images["html_1"]["filename"], "external.png")
         self.assertEqual(images["html_1"]["url"], "https://example.com/external.png")
 
-    @patch("policyengine_social.extract.requests.get")
+    @patch("policyengine_social.extract.re.compile")
+    @patch("policyengine_social.extract._SESSION.get", return_value=MOCK_RESPONSE)
+    def test_image_patterns_are_precompiled(self, mock_get, mock_compile):
+        """Test that extraction reuses the module's compiled image patterns."""
+        images = self.extractor.extract_images()
+
+        self.assertEqual(images, self.images)
+        mock_compile.assert_not_called()
+
+    @patch("policyengine_social.extract._SESSION.get")
+    def test_long_article(self, mock_get):
+        """Test extraction from an article with hundreds of images."""
+        markdown = (
+            "# Long post\n"
+            + "![Chart](charts/chart.png)\n" * 500
+            + '<img src="https://example.com/table.png">\n' * 500
+        )
+        mock_get.return_value = _blog_response(MOCK_POSTS_JSON, markdown)
+
+        images = self.extractor.extract_images()
+
+        self.assertEqual(len(images), 1001)  # Cover, 500 markdown, 500 HTML
+        self.assertIn("inline_500", images)
+        self.assertIn("html_500", images)
+
+    @patch("policyengine_social.extract._SESSION.get")
     def test_no_images_in_post(self, mock_get):
         """Test handling of posts with no images."""
-        mock_get.return_value.json.return_value = [
-            {
-                "title": "No Image Post",
-                "filename": "test-blog-post.md",
-                "date": "2024-01-01",
-            }
-        ]
-        mock_get.return_value.text = "# Post with no images\n\nJust text content."
+        mock_get.return_value = _blog_response(
+            [
+                {
+                    "title": "No Image Post",
+                    "filename": "test-blog-post.md",
+                    "date": "2024-01-01",
+                }
+            ],
+            "# Post with no images\n\nJust text content.",
+        )
 
         images = self.extractor.extract_images()
 
         # Should return empty dict or minimal set
         self.assertEqual(len(images), 0)
 
-    @patch("policyengine_social.extract.requests.get")
-    @patch("policyengine_social.extract.Path.write_bytes")
-    def test_download_image(self, mock_write, mock_get):
+    @patch("policyengine_social.extract._SESSION.get")
+    def test_blog_fetches_are_cached(self, mock_get):
+        """Test that extractors for the same post share one fetch."""
+        mock_get.return_value = MOCK_RESPONSE
+
+        first = self.extractor.extract_images()
+        second = BlogImageExtractor(self.test_slug).extract_images()
+
+        self.assertEqual(first, second)
+        self.assertEqual(mock_get.call_count, 2)  # posts.json + markdown
+
+    @patch("policyengine_social.extract._SESSION.get")
+    def test_failed_fetch_is_not_cached(self, mock_get):
+        """Test that an error page is fetched again rather than reused."""
+        not_found = Mock(spec=requests.Response)
+        not_found.raise_for_status.side_effect = requests.HTTPError("404")
+        mock_get.side_effect = [MOCK_RESPONSE, not_found, MOCK_RESPONSE]
+
+        with self.assertRaises(requests.HTTPError):
+            self.extractor.extract_images()
+        images = self.extractor.extract_images()
+
+        self.assertIn("cover", images)
+        self.assertEqual(mock_get.call_count, 3)  # markdown fetched twice
+
+    @patch("policyengine_social.extract._SESSION.get")
+    def test_download_image(self, mock_get):
         """Test image download and caching."""
-        # Mock successful download
-        mock_get.return_value.status_code = 200
-        mock_get.return_value.content = b"fake image data"
+        # Mock successful download, delivered in chunks
+        response = mock_get.return_value.__enter__.return_value
+        response.status_code = 200
+        response.iter_content.return_value = [b"fake ", b"image data"]
 
         image_info = {"filename": "test.png", "url": "https://example.com/test.png"}
 
-        result = self.extractor.download_image(image_info)
+        with tempfile.TemporaryDirectory() as tmp:
+            self.extractor.cache_dir = Path(tmp)
+            result = self.extractor.download_image(image_info)
+
+            # Should return path and write the whole file
+            self.assertEqual(result, Path(tmp) / "test.png")
+            self.assertEqual(result.read_bytes(), b"fake image data")
+            self.assertEqual(list(Path(tmp).iterdir()), [result])
+
+    @patch("policyengine_social.extract._SESSION.get")
+    def test_same_file_downloaded_twice_at_once(self, mock_get):
+        """Test that concurrent downloads of one filename don't collide."""
+        # Both downloads are mid-stream before either finishes
+        both_streaming = threading.Barrier(2, timeout=5)
+
+        def iter_content(chunk_size):
+            yield b"fake "
+            both_streaming.wait()
+            yield b"image data"
+
+        response = mock_get.return_value.__enter__.return_value
+        response.status_code = 200
+        response.iter_content.side_effect = iter_content
+
+        info = {"filename": "cover.png", "url": "https://example.com/cover.png"}
+        images = {"cover": info, "inline_1": dict(info)}
+
+        with tempfile.TemporaryDirectory() as tmp:
+            self.extractor.cache_dir = Path(tmp)
+            result = self.extractor.download_images(images)
+
+            cached = Path(tmp) / "cover.png"
+            self.assertEqual(result, {"cover": cached, "inline_1": cached})
+            self.assertEqual(cached.read_bytes(), b"fake image data")
+            self.assertEqual(list(Path(tmp).iterdir()), [cached])
+
+    def test_download_images(self):
+        """Test downloading several images, skipping failures."""
+        images = {
+            "cover": {"filename": "cover.png", "url": "https://example.com/c.png"},
+            "inline_1": {"filename": "chart.png", "url": "https://example.com/x.png"},
+        }
+        paths = {"cover.png": Path("assets/cache/cover.png"), "chart.png": None}
+
+        with patch.object(
+            self.extractor,
+            "download_image",
+            side_effect=lambda info: paths[info["filename"]],
+        ) as mock_download:
+            result = self.extractor.download_images(images)
 
-        # Should return path and write file
-        self.assertIsNotNone(result)
-        mock_write.assert_called_once_with(b"fake image data")
+        self.assertEqual(mock_download.call_count, 2)
+        self.assertEqual(result, {"cover": Path("assets/cache/cover.png")})
 
-    @patch("policyengine_social.extract.Image.open")
-    def test_optimize_for_platform_x(self, mock_image):
-        """Test image optimization for X/Twitter."""
-        # Mock PIL Image
-        mock_img = MagicMock()
+    def test_download_images_is_concurrent(self):
+        """Test that a post's images are all downloading at the same time."""
+        images = {
+            f"inline_{i}": {"filename": f"{i}.png", "url": f"https://example.com/{i}"}
+            for i in range(3)
+        }
+        # Only passes once every download is in flight, so sequential
+        # downloads would time out here
+        in_flight = threading.Barrier(len(images), timeout=5)
+
+        def download(info):
+            in_flight.wait()
+            return Path(info["filename"])
+
+        with patch.object(self.extractor, "download_image", side_effect=download):
+            result = self.extractor.download_images(images)
+
+        self.assertEqual(set(result), set(images))
+
+    @patch("policyengine_social.extract.Path.read_bytes", return_value=b"image")
+    @patch("PIL.Image.open")
+    def test_optimize_for_platform(self, mock_image, mock_read):
+        """Test image optimization to each platform's dimensions."""
+        for platform, size in [("x", (1200, 675)), ("linkedin", (1200, 627))]:
+            with self.subTest(platform=platform):
+                mock_img = MagicMock(width=2400, height=1350)
+                mock_image.return_value = mock_img
+
+                self.extractor.optimize_for_platform(Path("test.png"), platform)
+
+                # Should let the decoder shrink JPEGs first, then resize to
+                # the platform's specifications with LANCZOS
+                mock_img.draft.assert_called_once_with("RGB", size)
+                mock_img.thumbnail.assert_called_once()
+                self.assertEqual(
+                    mock_img.thumbnail.call_args[0],
+                    (size, Image.Resampling.LANCZOS),
+                )
+
+    @patch("policyengine_social.extract.Path.read_bytes", return_value=b"image")
+    @patch("PIL.Image.open")
+    def test_optimize_for_platforms(self, mock_image, mock_read):
+        """Test optimizing for several platforms from one decode."""
+        mock_img = MagicMock(width=2400, height=1350)
         mock_image.return_value = mock_img
 
         test_path = Path("test.png")
-        self.extractor.optimize_for_platform(test_path, "x")
+        paths = self.extractor.optimize_for_platforms(test_path, ["x", "linkedin"])
 
-        # Should resize to X specifications
+        # Should read, decode and downscale the source once, to cover both sizes
+        mock_read.assert_called_once()
+        mock_image.assert_called_once()
         mock_img.thumbnail.assert_called_once()
-        call_args = mock_img.thumbnail.call_args[0]
-        self.assertEqual(call_args[0], (1200, 675))  # X preferred dimensions
+        self.assertEqual(mock_img.thumbnail.call_args[0][0], (1200, 675))
+
+        # Then save one copy per platform
+        self.assertEqual(set(paths), {"x", "linkedin"})
+        self.assertEqual(mock_img.copy.return_value.save.call_count, 2)
 
-    @patch("policyengine_social.extract.Image.open")
-    def test_optimize_for_platform_linkedin(self, mock_image):
-        """Test image optimization for LinkedIn."""
-        mock_img = MagicMock()
+    @patch("policyengine_social.extract.Path.write_bytes")
+    @patch("policyengine_social.extract.Path.read_bytes", return_value=b"image")
+    @patch("PIL.Image.open")
+    def test_small_image_is_copied(self, mock_image, mock_read, mock_write):
+        """Test that an image already within the platform size isn't re-encoded."""
+        mock_img = MagicMock(width=800, height=500)
         mock_image.return_value = mock_img
 
-        test_path = Path("test.png")
-        self.extractor.optimize_for_platform(test_path, "linkedin")
+        self.extractor.optimize_for_platform(Path("test.png"), "x")
 
-        # Should resize to LinkedIn specifications
-        mock_img.thumbnail.assert_called_once()
-        call_args = mock_img.thumbnail.call_args[0]
-        self.assertEqual(call_args[0], (1200, 627))  # LinkedIn dimensions
+        mock_img.thumbnail.assert_not_called()
+        mock_img.save.assert_not_called()
+        mock_write.assert_called_once_with(b"image")
+
+    @patch("policyengine_social.extract.Path.exists", return_value=True)
+    @patch("policyengine_social.extract.Path.read_bytes", return_value=b"image")
+    @patch("PIL.Image.open")
+    def test_optimize_reuses_existing_output(self, mock_image, mock_read, mock_exists):
+        """Test that an unchanged source is not decoded or encoded again."""
+        result = self.extractor.optimize_for_platform(Path("test.png"), "x")
+
+        mock_image.assert_not_called()
+        self.assertTrue(result.name.endswith("-test.png"))
 
     def test_auto_select_images_x(self):
         """Test automatic image selection for X."""
@@ -183,30 +355,79 @@ And a final paragraph.
         # Should typically select just cover for LinkedIn
         self.assertIn("cover", selected)
 
-    @patch("policyengine_social.extract.subprocess.run")
-    def test_capture_screenshot(self, mock_run):
+    @patch("policyengine_social.extract._browser")
+    def test_capture_screenshot(self, mock_browser):
         """Test screenshot capture functionality."""
-        mock_run.return_value.returncode = 0
+        page = mock_browser.return_value.new_page.return_value
+
+        result = self.extractor.capture_screenshot(
+            "https://policyengine.org/us", "homepage"
+        )
+
+        # Should open the page and save a screenshot of it
+        self.assertEqual(result, self.extractor.cache_dir / "homepage.png")
+        page.goto.assert_called_once_with("https://policyengine.org/us")
+        page.screenshot.assert_called_once_with(path=str(result))
+        page.close.assert_called_once()
+
+        # Later screenshots reuse the same browser
+        self.extractor.capture_screenshot("https://policyengine.org/uk", "uk")
+        self.assertEqual(mock_browser.return_value.new_page.call_count, 2)
+
+    @patch("policyengine_social.extract._browser")
+    def test_capture_screenshot_failure(self, mock_browser):
+        """Test that a failed screenshot returns None."""
+        mock_browser.side_effect = ImportError("No module named 'playwright'")
 
         result = self.extractor.capture_screenshot(
             "https://policyengine.org/us", "homepage"
         )
 
-        # Should call playwright with correct arguments
-        self.assertIsNotNone(result)
-        mock_run.assert_called_once()
+        self.assertIsNone(result)
+
+    @patch("policyengine_social.extract.atexit.register")
+    def test_browser_is_launched_once(self, mock_register):
+        """Test that Chromium is started once and closed at exit."""
+        sync_api = MagicMock()
+        playwright = sync_api.sync_playwright.return_value.start.return_value
+        _browser.cache_clear()
+        self.addCleanup(_browser.cache_clear)
+
+        modules = {"playwright": MagicMock(), "playwright.sync_api": sync_api}
+        with patch.dict(sys.modules, modules):
+            first = _browser()
+            second = _browser()
 
-        # Check playwright command structure
-        call_args = mock_run.call_args[0][0]
-        self.assertEqual(call_args[0], "playwright")
-        self.assertEqual(call_args[1], "screenshot")
-        self.assertIn("https://policyengine.org/us", call_args)
+        self.assertIs(first, second)
+        playwright.chromium.launch.assert_called_once()
+        mock_register.assert_called_once()
+
+    @patch("policyengine_social.extract.atexit.register")
+    def test_failed_launch_stops_playwright(self, mock_register):
+        """Test that the Playwright driver is stopped if Chromium can't start."""
+        sync_api = MagicMock()
+        playwright = sync_api.sync_playwright.return_value.start.return_value
+        playwright.chromium.launch.side_effect = Exception("Executable doesn't exist")
+        _browser.cache_clear()
+        self.addCleanup(_browser.cache_clear)
+
+        modules = {"playwright": MagicMock(), "playwright.sync_api": sync_api}
+        with patch.dict(sys.modules, modules):
+            with self.assertRaises(Exception):
+                _browser()
+
+        playwright.stop.assert_called_once()
+        mock_register.assert_not_called()
 
 
 class TestImageIntegration(unittest.TestCase):
     """Integration tests for image handling."""
 
-    @patch("policyengine_social.extract.requests.get")
+    def setUp(self):
+        """Start without any cached blog fetches."""
+        clear_fetch_cache()
+
+    @patch("policyengine_social.extract._SESSION.get")
     def test_full_image_extraction_flow(self, mock_get):
         """Test complete flow from blog post to image manifest."""
         # Setup comprehensive mock data
@@ -227,8 +448,7 @@ class TestImageIntegration(unittest.TestCase):
 <img src="/assets/calculator.png">
 """
 
-        mock_get.return_value.json.return_value = mock_posts
-        mock_get.return_value.text = mock_content
+        mock_get.return_value = _blog_response(mock_posts, mock_content)
 
         extractor = BlogImageExtractor("policy-analysis")
         images = extractor.extract_images()
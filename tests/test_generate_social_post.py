@@ -2,22 +2,53 @@
 """
 Tests for social post generation functionality.
 """
-from datetime import datetime
 
 import unittest
-from unittest.mock import patch, MagicMock
+from datetime import datetime
+from unittest.mock import MagicMock, patch
 
+from policyengine_social.extract import clear_fetch_cache
 from policyengine_social.generate import SocialPostGenerator
 
+NOW = datetime(2024, 1, 1, 9, 0, 0)
+
+
+class _FrozenDateTime(datetime):
+    """datetime whose now() is always NOW."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return NOW
+
+
+# Stands in for the blog fetches behind generate_post_yaml's image
+# extraction, so no test here goes to the network
+_session_patcher = patch("policyengine_social.extract._SESSION.get")
+
+
+def setUpModule():
+    """Serve an empty posts.json and article for every blog fetch."""
+    clear_fetch_cache()
+    mock_get = _session_patcher.start()
+    mock_get.return_value.json.return_value = []
+    mock_get.return_value.text = ""
+
+
+def tearDownModule():
+    """Restore blog fetches and drop the stubbed responses."""
+    _session_patcher.stop()
+    clear_fetch_cache()
+
 
 class TestSocialPostGenerator(unittest.TestCase):
     """Test cases for social post generation."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.test_slug = "test-policy-reform"
-        self.test_title = "Test Policy Reform Analysis"
-        self.generator = SocialPostGenerator(self.test_slug, self.test_title)
+    @classmethod
+    def setUpClass(cls):
+        """Set up one generator for the class; no test modifies it."""
+        cls.test_slug = "test-policy-reform"
+        cls.test_title = "Test Policy Reform Analysis"
+        cls.generator = SocialPostGenerator(cls.test_slug, cls.test_title)
 
     def test_blog_url_generation(self):
         """Test that blog URLs are generated correctly."""
@@ -104,78 +135,65 @@ class TestSocialPostGenerator(unittest.TestCase):
         self.assertIn("🎉", thread[0])
         self.assertIn("excited", thread[0].lower())
 
+    @patch("policyengine_social.generate.datetime", _FrozenDateTime)
     def test_publish_time_scheduling(self):
-        """Test that publish times are set correctly."""
+        """Test that posts are scheduled for 10 AM the next day."""
         yaml_data = self.generator.generate_post_yaml()
 
-        publish_at = datetime.fromisoformat(yaml_data["publish_at"])
-        now = datetime.now()
-
-        # Should be scheduled for future
-        self.assertGreater(publish_at, now)
-
-        # Should be at 10 AM
-        self.assertEqual(publish_at.hour, 10)
-        self.assertEqual(publish_at.minute, 0)
+        self.assertEqual(yaml_data["publish_at"], "2024-01-02T10:00:00")
 
+    @patch("policyengine_social.generate.datetime", _FrozenDateTime)
     def test_metadata_inclusion(self):
         """Test metadata is properly included."""
         yaml_data = self.generator.generate_post_yaml()
 
         metadata = yaml_data["metadata"]
-        self.assertIn("generated_at", metadata)
+        self.assertEqual(metadata["generated_at"], NOW.isoformat())
         self.assertIn("generator_version", metadata)
         self.assertIn("auto_selected_images", metadata)
 
-        # Generated timestamp should be recent
-        generated = datetime.fromisoformat(metadata["generated_at"])
-        time_diff = datetime.now() - generated
-        self.assertLess(time_diff.total_seconds(), 60)  # Within last minute
-
 
 class TestContentVariations(unittest.TestCase):
     """Test different types of blog post content."""
 
-    def test_research_post(self):
-        """Test generation for research/analysis posts."""
-        generator = SocialPostGenerator(
-            "poverty-impact-analysis", "New Research: Poverty Impact of Tax Reform"
-        )
-
-        thread = generator.generate_x_thread()
-        linkedin = generator.generate_linkedin_post()
-
-        # Should emphasize data and findings
-        self.assertIn("New from PolicyEngine", thread[0])
-        self.assertIn("analysis", linkedin.lower())
-
-    def test_feature_announcement(self):
-        """Test generation for feature announcements."""
-        generator = SocialPostGenerator(
-            "new-calculator-features", "Introducing State-Level Analysis"
-        )
-
-        thread = generator.generate_x_thread()
-
-        # Should focus on capabilities
-        self.assertIn("Introducing", thread[0])
-
-    def test_policy_comparison(self):
-        """Test generation for policy comparison posts."""
-        generator = SocialPostGenerator(
-            "policy-a-vs-policy-b", "Comparing Two Approaches to Child Tax Credit"
-        )
-
-        linkedin = generator.generate_linkedin_post()
-
-        # Should highlight comparison aspect
-        self.assertIn("Comparing", linkedin)
+    def test_content_variations(self):
+        """Test that each kind of post keeps its framing in the copy."""
+        # slug, title, expected in the first tweet, expected on LinkedIn
+        cases = [
+            (
+                "poverty-impact-analysis",
+                "New Research: Poverty Impact of Tax Reform",
+                "New from PolicyEngine",  # Should emphasize data and findings
+                "analysis",
+            ),
+            (
+                "new-calculator-features",
+                "Introducing State-Level Analysis",
+                "Introducing",  # Should focus on capabilities
+                None,
+            ),
+            (
+                "policy-a-vs-policy-b",
+                "Comparing Two Approaches to Child Tax Credit",
+                None,
+                "Comparing",  # Should highlight comparison aspect
+            ),
+        ]
+
+        for slug, title, in_thread, in_linkedin in cases:
+            with self.subTest(slug=slug):
+                generator = SocialPostGenerator(slug, title)
+
+                if in_thread:
+                    self.assertIn(in_thread, generator.generate_x_thread()[0])
+                if in_linkedin:
+                    self.assertIn(in_linkedin, generator.generate_linkedin_post())
 
 
 class TestErrorHandling(unittest.TestCase):
     """Test error handling in post generation."""
 
-    @patch("policyengine_social.generate.requests.get")
+    @patch("policyengine_social.extract._SESSION.get")
     def test_blog_fetch_failure(self, mock_get):
         """Test handling of blog fetch failures."""
         mock_get.side_effect = Exception("Network error")
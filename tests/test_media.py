@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests for image attachment helpers.
+"""
+
+import os
+import tempfile
+import unittest
+
+from policyengine_social import media
+
+
+class TestImageMeta(unittest.TestCase):
+    """Test cases for cached image metadata lookups."""
+
+    def setUp(self):
+        """Set up an image file and an empty cache."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "chart.png")
+        with open(self.path, "wb") as f:
+            f.write(b"12345")
+        media._stat_image.cache_clear()
+
+    def tearDown(self):
+        """Clean up."""
+        self.tmp.cleanup()
+
+    def test_image_meta(self):
+        """Metadata has the file name, MIME type and size."""
+        self.assertEqual(
+            media.image_meta(self.path),
+            media.ImageMeta("chart.png", "image/png", 5),
+        )
+
+    def test_lookups_are_cached(self):
+        """Repeated lookups of the same path stat the file once."""
+        media.image_meta(self.path)
+        media.image_meta(self.path)
+
+        self.assertEqual(media._stat_image.cache_info().misses, 1)
+
+    def test_missing_file_is_not_cached(self):
+        """A file that appears later is found on the next lookup."""
+        path = os.path.join(self.tmp.name, "later.png")
+        self.assertIsNone(media.image_meta(path))
+
+        open(path, "wb").close()
+
+        self.assertIsNotNone(media.image_meta(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Tests for scripts/publish_post.py.
+"""
+
+import importlib.util
+import io
+import unittest
+from pathlib import Path
+from unittest.mock import ANY, MagicMock, patch
+
+from policyengine_social.publishers.x_multi import MultiAccountXPublisher
+
+SCRIPT = Path(__file__).parent.parent / "scripts" / "publish_post.py"
+_spec = importlib.util.spec_from_file_location("publish_post", SCRIPT)
+publish_post = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(publish_post)
+
+RATE_LIMITED = {
+    "success": False,
+    "error": "429 Too Many Requests",
+    "retry_after": None,
+}
+
+
+def _tweet(n):
+    """Result of successfully posting tweet number ``n``."""
+    return {"success": True, "tweet_id": str(n), "url": f"https://x.com/i/{n}"}
+
+
+def _make_publisher():
+    """Create an X publisher whose post() is mocked and never paced."""
+    with patch.object(MultiAccountXPublisher, "__init__", return_value=None):
+        publisher = MultiAccountXPublisher()
+    publisher.config = {"settings": {"default_account": "thepolicyengine"}}
+    publisher._thread_pacer = MagicMock()
+    publisher.post = MagicMock()
+    return publisher
+
+
+class TestIsTransient(unittest.TestCase):
+    """Test cases for deciding which failures to retry."""
+
+    def test_rate_limits_and_server_errors_are_transient(self):
+        """429s and 5xx errors are retried."""
+        for error in ["429 Too Many Requests", "503 Service Unavailable", "500"]:
+            with self.subTest(error=error):
+                result = {"success": False, "error": error}
+                self.assertTrue(publish_post._is_transient(result))
+
+    def test_other_failures_are_not_transient(self):
+        """Successes, client errors and missing errors are not retried."""
+        for result in [
+            {"success": True, "error": "429"},
+            {"success": False, "error": "403 Forbidden"},
+            {"success": False},
+        ]:
+            with self.subTest(result=result):
+                self.assertFalse(publish_post._is_transient(result))
+
+    def test_partial_thread_is_not_transient(self):
+        """A thread that posted anything is never retried."""
+        result = {**RATE_LIMITED, "posts": [_tweet(1)]}
+
+        self.assertFalse(publish_post._is_transient(result))
+
+
+class TestBackoff(unittest.TestCase):
+    """Test cases for the delay between retries."""
+
+    @patch.object(publish_post.random, "random", return_value=0.0)
+    @patch.object(publish_post.time, "sleep")
+    def test_delay_doubles_each_attempt(self, mock_sleep, mock_random):
+        """Without a server hint, attempts wait 1, 2, 4... seconds."""
+        for attempt in range(3):
+            publish_post._backoff(attempt)
+
+        delays = [c.args[0] for c in mock_sleep.call_args_list]
+        self.assertEqual(delays, [1, 2, 4])
+
+    @patch.object(publish_post.random, "random", return_value=0.0)
+    @patch.object(publish_post.time, "sleep")
+    def test_waits_at_least_retry_after(self, mock_sleep, mock_random):
+        """A server's Retry-After takes precedence over a shorter backoff."""
+        publish_post._backoff(0, [{"retry_after": 7}, {"retry_after": None}])
+
+        mock_sleep.assert_called_once_with(7)
+
+    @patch.object(publish_post.random, "random", return_value=1.0)
+    @patch.object(publish_post.time, "sleep")
+    def test_delay_is_capped(self, mock_sleep, mock_random):
+        """Jitter and long server hints never exceed the maximum backoff."""
+        publish_post._backoff(0, [{"retry_after": 3600}])
+
+        mock_sleep.assert_called_once_with(publish_post.MAX_BACKOFF_SECONDS)
+
+
+@patch.object(publish_post, "_backoff")
+class TestWithRetry(unittest.TestCase):
+    """Test cases for retrying single posts and threads."""
+
+    def setUp(self):
+        """Set up a publisher and a rate limiter that never blocks."""
+        self.publisher = _make_publisher()
+        self.bucket = MagicMock()
+
+    def _post_thread(self):
+        """Post a three-part thread through the retry wrapper."""
+        return publish_post._with_retry(
+            lambda: self.publisher.post_thread(["One", "Two", "Three"]),
+            self.bucket,
+        )
+
+    def test_success_is_not_retried(self, mock_backoff):
+        """A successful call is made once."""
+        fn = MagicMock(return_value=_tweet(1))
+
+        self.assertEqual(publish_post._with_retry(fn, self.bucket), _tweet(1))
+        fn.assert_called_once()
+        mock_backoff.assert_not_called()
+
+    def test_gives_up_after_max_retries(self, mock_backoff):
+        """A call that keeps failing is attempted 1 + max_retries times."""
+        fn = MagicMock(return_value=RATE_LIMITED)
+
+        result = publish_post._with_retry(fn, self.bucket, max_retries=2)
+
+        self.assertFalse(result["success"])
+        self.assertEqual(fn.call_count, 3)
+        self.assertEqual(self.bucket.acquire.call_count, 3)
+
+    def test_thread_rate_limited_on_first_post_is_retried(self, mock_backoff):
+        """A thread that posted nothing before a 429 is tried again."""
+        self.publisher.post.side_effect = [
+            RATE_LIMITED,
+            _tweet(1),
+            _tweet(2),
+            _tweet(3),
+        ]
+
+        result = self._post_thread()
+
+        self.assertTrue(result["success"])
+        self.assertEqual(len(result["posts"]), 3)
+        mock_backoff.assert_called_once_with(0, [ANY])
+
+    def test_thread_failing_partway_is_not_retried(self, mock_backoff):
+        """Retrying a partly posted thread would duplicate its first posts."""
+        self.publisher.post.side_effect = [_tweet(1), RATE_LIMITED]
+
+        result = self._post_thread()
+
+        self.assertFalse(result["success"])
+        self.assertEqual(len(result["posts"]), 1)
+        self.assertEqual(result["error"], "429 Too Many Requests")
+        self.assertEqual(self.publisher.post.call_count, 2)
+        mock_backoff.assert_not_called()
+
+
+@patch.object(publish_post, "_backoff")
+class TestRepostWithRetry(unittest.TestCase):
+    """Test cases for retrying reposts across accounts."""
+
+    def setUp(self):
+        """Use fresh token buckets for every test."""
+        publish_post._rate_limiter.cache_clear()
+        self.addCleanup(publish_post._rate_limiter.cache_clear)
+
+    def test_only_failed_accounts_are_retried(self, mock_backoff):
+        """Accounts that reposted aren't asked to repost again."""
+        repost = MagicMock(
+            side_effect=[
+                {"a": {"success": True}, "b": RATE_LIMITED},
+                {"b": {"success": True}},
+            ]
+        )
+
+        results = publish_post._repost_with_retry("bluesky", repost, ["a", "b"])
+
+        self.assertEqual(results, {"a": {"success": True}, "b": {"success": True}})
+        self.assertEqual(
+            [c.kwargs["to_accounts"] for c in repost.call_args_list],
+            [["a", "b"], ["b"]],
+        )
+        mock_backoff.assert_called_once_with(0, [RATE_LIMITED])
+
+    def test_permanent_failures_are_not_retried(self, mock_backoff):
+        """An account that fails with a non-transient error is left alone."""
+        forbidden = {"success": False, "error": "403 Forbidden"}
+        repost = MagicMock(return_value={"a": forbidden})
+
+        results = publish_post._repost_with_retry("bluesky", repost, ["a"])
+
+        self.assertEqual(results, {"a": forbidden})
+        repost.assert_called_once()
+        mock_backoff.assert_not_called()
+
+
+@patch.object(publish_post, "load_dotenv")
+@patch("sys.stderr", new_callable=io.StringIO)
+@patch("sys.stdout", new_callable=io.StringIO)
+class TestPublishPlatforms(unittest.TestCase):
+    """Test cases for publishing to several platforms at once."""
+
+    POST = {"title": "Test", "platforms": {"x": {}, "bluesky": {}, "linkedin": {}}}
+
+    def _publish(self, handlers):
+        """Publish POST in production mode with the given platform handlers."""
+        with patch.object(publish_post, "PLATFORM_HANDLERS", handlers):
+            with patch.object(publish_post, "pop_parsed", return_value=self.POST):
+                publish_post.publish_post("post.yaml", prod=True)
+
+    def test_output_is_in_handler_order(self, mock_stdout, mock_stderr, mock_dotenv):
+        """Each platform's lines are printed together, in PLATFORM_HANDLERS order."""
+        self._publish(
+            [
+                ("x", lambda config: ["x posted"]),
+                ("bluesky", lambda config: ["bluesky posted"]),
+            ]
+        )
+
+        output = mock_stdout.getvalue()
+        self.assertLess(output.index("x posted"), output.index("bluesky posted"))
+
+    def test_raising_platform_keeps_others_output(
+        self, mock_stdout, mock_stderr, mock_dotenv
+    ):
+        """A platform that raises is reported without losing what others posted."""
+
+        def fail(config):
+            raise RuntimeError("boom")
+
+        with self.assertRaises(SystemExit) as cm:
+            self._publish(
+                [
+                    ("x", lambda config: ["x posted"]),
+                    ("bluesky", fail),
+                    ("linkedin", lambda config: ["linkedin posted"]),
+                ]
+            )
+
+        self.assertEqual(cm.exception.code, 1)
+        output = mock_stdout.getvalue()
+        self.assertIn("x posted", output)
+        self.assertIn("linkedin posted", output)
+        self.assertIn("bluesky raised RuntimeError: boom", output)
+        self.assertIn("RuntimeError: boom", mock_stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
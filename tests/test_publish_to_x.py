@@ -2,22 +2,42 @@
 """
 Tests for X/Twitter publishing functionality.
 """
-from unittest.mock import patch, MagicMock
 
+import copy
 import unittest
-from pathlib import Path
 from datetime import datetime, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
 
 from policyengine_social.publish import XPublisher
 
+# Sample post data; tests get their own copy since publishing updates it
+POST_TEMPLATE = {
+    "title": "Test Post",
+    "images": {
+        "cover": {"filename": "test.png", "url": "https://example.com/test.png"}
+    },
+    "platforms": {
+        "x": {
+            "thread": [
+                "First tweet in thread",
+                "Second tweet with details",
+                "Final tweet with link",
+            ],
+            "media": ["cover"],
+        }
+    },
+}
+
 
 class TestXPublisher(unittest.TestCase):
     """Test cases for X/Twitter publishing."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        # Mock environment variables
-        self.env_patcher = patch.dict(
+    @classmethod
+    def setUpClass(cls):
+        """Mock environment variables once for the whole class."""
+        cls.env_patcher = patch.dict(
             "os.environ",
             {
                 "X_API_KEY": "test_key",
@@ -26,53 +46,45 @@ class TestXPublisher(unittest.TestCase):
                 "X_ACCESS_SECRET": "test_token_secret",
             },
         )
-        self.env_patcher.start()
-
-        # Sample post data
-        self.test_post = {
-            "title": "Test Post",
-            "publish_at": datetime.now().isoformat(),
-            "images": {
-                "cover": {"filename": "test.png", "url": "https://example.com/test.png"}
-            },
-            "platforms": {
-                "x": {
-                    "thread": [
-                        "First tweet in thread",
-                        "Second tweet with details",
-                        "Final tweet with link",
-                    ],
-                    "media": ["cover"],
-                }
-            },
-        }
+        cls.env_patcher.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        """Restore the environment."""
+        cls.env_patcher.stop()
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.test_post = copy.deepcopy(POST_TEMPLATE)
+        self.test_post["publish_at"] = datetime.now().isoformat()
+
+        # Mock the X clients and the pause between thread tweets
+        self.mock_client = self._start_patch("tweepy.Client")
+        self.mock_api = self._start_patch("tweepy.API")
+        self.mock_sleep = self._start_patch("policyengine_social.ratelimit.time.sleep")
 
-    def tearDown(self):
-        """Clean up."""
-        self.env_patcher.stop()
+    def _start_patch(self, target):
+        patcher = patch(target)
+        self.addCleanup(patcher.stop)
+        return patcher.start()
 
-    @patch("policyengine_social.publish.tweepy.Client")
-    @patch("policyengine_social.publish.tweepy.API")
-    def test_publisher_initialization(self, mock_api, mock_client):
+    def test_publisher_initialization(self):
         """Test XPublisher initialization with credentials."""
         XPublisher()
 
         # Should initialize both v2 client and v1.1 API
-        mock_client.assert_called_once()
-        mock_api.assert_called_once()
+        self.mock_client.assert_called_once()
+        self.mock_api.assert_called_once()
 
-    @patch("policyengine_social.publish.tweepy.Client")
-    @patch("policyengine_social.publish.tweepy.API")
-    def test_publish_single_tweet(self, mock_api, mock_client):
+    def test_publish_single_tweet(self):
         """Test publishing a single tweet without thread."""
         publisher = XPublisher()
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
+        mock_client_instance = self.mock_client.return_value
 
         # Mock tweet response
-        mock_response = MagicMock()
-        mock_response.data = {"id": "123456789"}
-        mock_client_instance.create_tweet.return_value = mock_response
+        mock_client_instance.create_tweet.return_value = SimpleNamespace(
+            data={"id": "123456789"}
+        )
 
         thread = ["Single tweet test"]
         result = publisher.publish_thread(thread)
@@ -83,56 +95,42 @@ class TestXPublisher(unittest.TestCase):
         )
         self.assertEqual(result, "123456789")
 
-    @patch("policyengine_social.publish.tweepy.Client")
-    @patch("policyengine_social.publish.tweepy.API")
-    @patch("policyengine_social.publish.time.sleep")
-    def test_publish_thread(self, mock_sleep, mock_api, mock_client):
+    def test_publish_thread(self):
         """Test publishing a multi-tweet thread."""
         publisher = XPublisher()
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
+        mock_client_instance = self.mock_client.return_value
 
         # Mock tweet responses
-        tweet_ids = ["111", "222", "333"]
-        responses = []
-        for tweet_id in tweet_ids:
-            mock_response = MagicMock()
-            mock_response.data = {"id": tweet_id}
-            responses.append(mock_response)
-
-        mock_client_instance.create_tweet.side_effect = responses
+        mock_client_instance.create_tweet.side_effect = [
+            SimpleNamespace(data={"id": tweet_id}) for tweet_id in ["111", "222", "333"]
+        ]
 
         thread = ["Tweet 1", "Tweet 2", "Tweet 3"]
         result = publisher.publish_thread(thread)
 
         # Should create 3 tweets
-        self.assertEqual(mock_client_instance.create_tweet.call_count, 3)
+        first_call, second_call, third_call = (
+            mock_client_instance.create_tweet.call_args_list
+        )
 
         # First tweet should not be a reply
-        first_call = mock_client_instance.create_tweet.call_args_list[0]
-        self.assertNotIn("in_reply_to_tweet_id", first_call[1])
+        self.assertNotIn("in_reply_to_tweet_id", first_call.kwargs)
 
         # Subsequent tweets should be replies
-        second_call = mock_client_instance.create_tweet.call_args_list[1]
-        self.assertEqual(second_call[1]["in_reply_to_tweet_id"], "111")
-
-        third_call = mock_client_instance.create_tweet.call_args_list[2]
-        self.assertEqual(third_call[1]["in_reply_to_tweet_id"], "222")
+        self.assertEqual(second_call.kwargs["in_reply_to_tweet_id"], "111")
+        self.assertEqual(third_call.kwargs["in_reply_to_tweet_id"], "222")
 
         # Should return first tweet ID
         self.assertEqual(result, "111")
 
         # Should sleep between tweets
-        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertEqual(self.mock_sleep.call_count, 2)
 
-    @patch("policyengine_social.publish.tweepy.Client")
-    @patch("policyengine_social.publish.tweepy.API")
-    @patch("policyengine_social.publish.BlogImageExtractor")
-    def test_media_upload(self, mock_extractor_class, mock_api, mock_client):
+    @patch("policyengine_social.extract.BlogImageExtractor")
+    def test_media_upload(self, mock_extractor_class):
         """Test image upload for tweets."""
         publisher = XPublisher()
-        mock_api_instance = MagicMock()
-        mock_api.return_value = mock_api_instance
+        mock_api_instance = self.mock_api.return_value
 
         # Mock image download and optimization
         mock_extractor = MagicMock()
@@ -141,9 +139,9 @@ class TestXPublisher(unittest.TestCase):
         mock_extractor.optimize_for_platform.return_value = Path("test_opt.png")
 
         # Mock media upload
-        mock_media = MagicMock()
-        mock_media.media_id_string = "media_123"
-        mock_api_instance.media_upload.return_value = mock_media
+        mock_api_instance.media_upload.return_value = SimpleNamespace(
+            media_id_string="media_123"
+        )
 
         images = {
             "cover": {"filename": "test.png", "url": "https://example.com/test.png"}
@@ -154,23 +152,22 @@ class TestXPublisher(unittest.TestCase):
         # Should download, optimize, and upload
         mock_extractor.download_image.assert_called_once()
         mock_extractor.optimize_for_platform.assert_called_once()
-        mock_api_instance.media_upload.assert_called_once()
-
         self.assertEqual(result, ["media_123"])
 
-    @patch("policyengine_social.publish.tweepy.Client")
-    @patch("policyengine_social.publish.tweepy.API")
-    def test_publish_post_complete_flow(self, mock_api, mock_client):
+        # Should hand tweepy the file's path, not its bytes, so it streams
+        # the upload from disk
+        mock_api_instance.media_upload.assert_called_once_with("test_opt.png")
+
+    def test_publish_post_complete_flow(self):
         """Test complete post publishing flow."""
         publisher = XPublisher()
 
         # Mock successful publication
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
+        mock_client_instance = self.mock_client.return_value
 
-        mock_response = MagicMock()
-        mock_response.data = {"id": "999"}
-        mock_client_instance.create_tweet.return_value = mock_response
+        mock_client_instance.create_tweet.return_value = SimpleNamespace(
+            data={"id": "999"}
+        )
 
         # Mock media upload
         with patch.object(publisher, "upload_media", return_value=["media_123"]):
@@ -182,15 +179,12 @@ class TestXPublisher(unittest.TestCase):
         self.assertIn("published_at", self.test_post["platforms"]["x"])
         self.assertIn("tweet_id", self.test_post["platforms"]["x"])
 
-    @patch("policyengine_social.publish.tweepy.Client")
-    @patch("policyengine_social.publish.tweepy.API")
-    def test_error_handling(self, mock_api, mock_client):
+    def test_error_handling(self):
         """Test error handling during publication."""
         publisher = XPublisher()
 
         # Mock API error
-        mock_client_instance = MagicMock()
-        mock_client.return_value = mock_client_instance
+        mock_client_instance = self.mock_client.return_value
         mock_client_instance.create_tweet.side_effect = Exception("API Error")
 
         result = publisher.publish_post(self.test_post)
@@ -207,17 +201,16 @@ class TestPublishingSchedule(unittest.TestCase):
 
     def test_should_publish_now(self):
         """Test logic for determining if post should be published."""
+        now = datetime(2024, 1, 1, 9, 0, 0)
+
         # Post scheduled for past should publish
-        past_post = {"publish_at": (datetime.now() - timedelta(hours=1)).isoformat()}
+        past_post = {"publish_at": (now - timedelta(hours=1)).isoformat()}
 
         # Post scheduled for future should not publish
-        future_post = {"publish_at": (datetime.now() + timedelta(hours=1)).isoformat()}
-
-        past_time = datetime.fromisoformat(past_post["publish_at"])
-        future_time = datetime.fromisoformat(future_post["publish_at"])
+        future_post = {"publish_at": (now + timedelta(hours=1)).isoformat()}
 
-        self.assertLess(past_time, datetime.now())
-        self.assertGreater(future_time, datetime.now())
+        self.assertLess(past_post["publish_at"], now.isoformat())
+        self.assertGreater(future_post["publish_at"], now.isoformat())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for API rate limiting helpers.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from policyengine_social.ratelimit import MinIntervalLimiter, TokenBucket, retry_after
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test cases for the token bucket rate limiter."""
+
+    @patch("policyengine_social.ratelimit.time.sleep")
+    @patch("policyengine_social.ratelimit.time.monotonic", return_value=100.0)
+    def test_burst_does_not_block(self, mock_monotonic, mock_sleep):
+        """Calls within the bucket capacity should never sleep."""
+        bucket = TokenBucket(capacity=3, refill_per_sec=1)
+
+        for _ in range(3):
+            self.assertEqual(bucket.acquire(), 0.0)
+
+        mock_sleep.assert_not_called()
+
+    @patch("policyengine_social.ratelimit.time.sleep")
+    @patch("policyengine_social.ratelimit.time.monotonic", return_value=100.0)
+    def test_empty_bucket_waits_for_refill(self, mock_monotonic, mock_sleep):
+        """Once tokens run out, callers wait for the next token."""
+        bucket = TokenBucket(capacity=1, refill_per_sec=0.5)
+
+        bucket.acquire()
+        waited = bucket.acquire()
+
+        # One token at 0.5 tokens/sec takes two seconds
+        self.assertAlmostEqual(waited, 2.0)
+        mock_sleep.assert_called_once_with(waited)
+
+    @patch("policyengine_social.ratelimit.time.sleep")
+    @patch("policyengine_social.ratelimit.time.monotonic")
+    def test_tokens_refill_over_time(self, mock_monotonic, mock_sleep):
+        """Elapsed time refills the bucket up to its capacity."""
+        mock_monotonic.return_value = 0.0
+        bucket = TokenBucket(capacity=2, refill_per_sec=1)
+        bucket.acquire()
+        bucket.acquire()
+
+        # Much later the bucket is full again, but never over capacity
+        mock_monotonic.return_value = 60.0
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertGreater(bucket.acquire(), 0.0)
+
+
+class TestMinIntervalLimiter(unittest.TestCase):
+    """Test cases for the per-key interval pacer."""
+
+    @patch("policyengine_social.ratelimit.time.sleep")
+    @patch("policyengine_social.ratelimit.time.monotonic")
+    def test_only_remaining_interval_is_slept(self, mock_monotonic, mock_sleep):
+        """Time spent between calls counts towards the interval."""
+        mock_monotonic.return_value = 10.0
+        pacer = MinIntervalLimiter(2)
+        self.assertEqual(pacer.wait(), 0.0)
+
+        mock_monotonic.return_value = 11.5
+        self.assertAlmostEqual(pacer.wait(), 0.5)
+
+        mock_monotonic.return_value = 20.0
+        self.assertEqual(pacer.wait(), 0.0)
+        mock_sleep.assert_called_once_with(0.5)
+
+    @patch("policyengine_social.ratelimit.time.sleep")
+    @patch("policyengine_social.ratelimit.time.monotonic", return_value=10.0)
+    def test_keys_are_paced_separately(self, mock_monotonic, mock_sleep):
+        """Calls for one key don't wait on another key's calls."""
+        pacer = MinIntervalLimiter(2)
+
+        self.assertEqual(pacer.wait("policyengine"), 0.0)
+        self.assertEqual(pacer.wait("policyengineus"), 0.0)
+        self.assertEqual(pacer.wait("policyengine"), 2.0)
+
+
+class TestRetryAfter(unittest.TestCase):
+    """Test cases for reading retry delays from failed requests."""
+
+    def _error(self, headers):
+        error = Exception("429 Too Many Requests")
+        error.response = MagicMock(headers=headers)
+        return error
+
+    def test_retry_after_seconds(self):
+        """A Retry-After header is a number of seconds."""
+        self.assertEqual(retry_after(self._error({"Retry-After": "30"})), 30.0)
+
+    @patch("policyengine_social.ratelimit.time.time", return_value=1000.0)
+    def test_reset_timestamp(self, mock_time):
+        """X and Bluesky reset headers are Unix timestamps."""
+        self.assertEqual(retry_after(self._error({"x-rate-limit-reset": "1045"})), 45.0)
+        self.assertEqual(retry_after(self._error({"ratelimit-reset": "990"})), 0.0)
+
+    def test_no_hint(self):
+        """Errors without a response or rate-limit headers give None."""
+        self.assertIsNone(retry_after(Exception("boom")))
+        self.assertIsNone(retry_after(self._error({"content-type": "text/html"})))
+        self.assertIsNone(retry_after(self._error({"retry-after": "soon"})))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-account X publishing.
+"""
+
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from policyengine_social import yaml_utils
+from policyengine_social.publishers.x_multi import MultiAccountXPublisher
+
+CONFIG = {
+    "accounts": {
+        "thepolicyengine": {
+            "api_key": "key",
+            "api_secret": "secret",
+            "access_token": "token",
+            "access_token_secret": "token-secret",
+        }
+    },
+    "settings": {"default_account": "thepolicyengine", "thread_delay_seconds": 2},
+}
+
+
+def _make_publisher():
+    """Create a publisher for CONFIG with mocked X clients."""
+    load = patch.object(MultiAccountXPublisher, "_load_from_env", return_value=CONFIG)
+    with patch("tweepy.Client"), patch("tweepy.API"):
+        with patch("tweepy.OAuth1UserHandler"), load:
+            return MultiAccountXPublisher()
+
+
+class TestUploadMedia(unittest.TestCase):
+    """Test cases for uploading media for a post."""
+
+    def setUp(self):
+        """Set up a publisher with mocked X clients."""
+        self.publisher = _make_publisher()
+        self.api = self.publisher.apis["thepolicyengine"] = MagicMock()
+        self.api.media_upload.side_effect = lambda path: MagicMock(
+            media_id_string=os.path.basename(path)
+        )
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        """Clean up."""
+        self.tmp.cleanup()
+
+    def _image(self, name):
+        path = os.path.join(self.tmp.name, name)
+        with open(path, "wb") as f:
+            f.write(name.encode())
+        return path
+
+    def test_media_ids_keep_image_order(self):
+        """Each image is uploaded once and IDs come back in the original order."""
+        paths = [self._image(f"chart{i}.png") for i in range(1, 5)]
+
+        media_ids = self.publisher._upload_media("thepolicyengine", paths)
+
+        self.assertEqual(self.api.media_upload.call_count, 4)
+        self.assertEqual(
+            media_ids, ["chart1.png", "chart2.png", "chart3.png", "chart4.png"]
+        )
+
+    def test_missing_images_are_skipped(self):
+        """Paths that don't exist are not uploaded."""
+        paths = [self._image("chart.png"), os.path.join(self.tmp.name, "gone.png")]
+
+        media_ids = self.publisher._upload_media("thepolicyengine", paths)
+
+        self.assertEqual(media_ids, ["chart.png"])
+        self.assertIsNone(self.publisher._upload_media("thepolicyengine", [paths[1]]))
+
+
+class TestSessions(unittest.TestCase):
+    """Test cases for the HTTP sessions behind each account's client."""
+
+    def test_accounts_have_separate_sessions(self):
+        """Accounts don't share a cookie jar, but each keeps pooling and retries."""
+        accounts = dict(CONFIG["accounts"])
+        accounts["policyengineus"] = accounts["thepolicyengine"]
+        config = {**CONFIG, "accounts": accounts}
+
+        load = patch.object(
+            MultiAccountXPublisher, "_load_from_env", return_value=config
+        )
+        client = patch("tweepy.Client", side_effect=lambda **kwargs: MagicMock())
+        with client, patch("tweepy.API"), patch("tweepy.OAuth1UserHandler"), load:
+            publisher = MultiAccountXPublisher()
+
+        first, second = (client.session for client in publisher.clients.values())
+        self.assertIsInstance(first, requests.Session)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.cookies, second.cookies)
+        adapter = second.get_adapter("https://api.twitter.com/2/tweets")
+        self.assertEqual(adapter.max_retries.total, 3)
+
+
+class TestRouteByContent(unittest.TestCase):
+    """Test cases for picking an account from the post text."""
+
+    def setUp(self):
+        """Set up a publisher with mocked X clients."""
+        self.publisher = _make_publisher()
+
+    def test_country_mentions(self):
+        """Posts mentioning a country go to that country's account."""
+        cases = {
+            "New analysis of United States tax policy": "policyengineus",
+            "How the U.S. child tax credit works": "policyengineus",
+            "Benefits across Britain": "policyengineuk",
+            "Budget changes in the UK and US economies": "policyengineus",
+            "A new PolicyEngine feature": "thepolicyengine",
+        }
+        for text, account in cases.items():
+            self.assertEqual(self.publisher.route_by_content(text), account, text)
+
+
+class TestConfigFile(unittest.TestCase):
+    """Test cases for loading accounts from a config file."""
+
+    def setUp(self):
+        """Write a config file and start with an empty parse cache."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.config_path = os.path.join(self.tmp.name, "x_accounts.yaml")
+        with open(self.config_path, "w") as f:
+            yaml_utils.safe_dump(CONFIG, f)
+        yaml_utils._load_yaml_cached.cache_clear()
+
+    def tearDown(self):
+        """Clean up."""
+        self.tmp.cleanup()
+
+    @patch("tweepy.OAuth1UserHandler")
+    @patch("tweepy.API")
+    @patch("tweepy.Client")
+    def test_unchanged_config_is_parsed_once(self, mock_client, mock_api, mock_auth):
+        """Publishers created from the same file share one parse."""
+        first = MultiAccountXPublisher(self.config_path, use_env=False)
+        second = MultiAccountXPublisher(self.config_path, use_env=False)
+
+        self.assertEqual(first.config, CONFIG)
+        self.assertEqual(second.config, CONFIG)
+        self.assertEqual(yaml_utils._load_yaml_cached.cache_info().misses, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for YAML loading helpers.
+"""
+
+import datetime
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import yaml
+
+from policyengine_social import yaml_utils
+
+
+class TestLibyaml(unittest.TestCase):
+    """Test that posts are parsed with the libyaml bindings."""
+
+    @unittest.skipUnless(yaml.__with_libyaml__, "PyYAML built without libyaml")
+    def test_c_loader_and_dumper_are_used(self):
+        """The C loader and dumper are picked up when PyYAML has them."""
+        self.assertIs(yaml_utils.SafeLoader, yaml.CSafeLoader)
+        self.assertIs(yaml_utils.SafeDumper, yaml.CSafeDumper)
+
+
+class TestParsedCache(unittest.TestCase):
+    """Test handing a parsed post from validation to publishing."""
+
+    def setUp(self):
+        """Set up a post file and an isolated cache directory."""
+        self.tmp = tempfile.TemporaryDirectory()
+        tmp_path = Path(self.tmp.name)
+        self.cache_patcher = patch.object(
+            yaml_utils, "PARSED_CACHE_DIR", tmp_path / "cache"
+        )
+        self.cache_patcher.start()
+
+        self.post_path = tmp_path / "post.yaml"
+        self.post_path.write_text("title: Test\nplatforms:\n  x:\n    post: Hello\n")
+        with open(self.post_path) as f:
+            self.post = yaml_utils.safe_load(f)
+
+    def tearDown(self):
+        """Clean up."""
+        self.cache_patcher.stop()
+        self.tmp.cleanup()
+
+    def test_round_trip(self):
+        """A saved parse is returned once and then removed."""
+        cache_path = yaml_utils.save_parsed(self.post_path, self.post)
+
+        self.assertEqual(yaml_utils.pop_parsed(self.post_path), self.post)
+        self.assertFalse(cache_path.exists())
+        self.assertIsNone(yaml_utils.pop_parsed(self.post_path))
+
+    def test_edited_file_ignores_cache(self):
+        """Changing the YAML after validation invalidates the cached parse."""
+        yaml_utils.save_parsed(self.post_path, self.post)
+        self.post_path.write_text("title: Edited\nplatforms: {}\n")
+
+        self.assertIsNone(yaml_utils.pop_parsed(self.post_path))
+
+    def test_unserializable_post_is_not_cached(self):
+        """Values JSON can't represent (like YAML dates) skip the cache."""
+        post = {"title": "Test", "date": datetime.date(2024, 1, 1)}
+
+        self.assertIsNone(yaml_utils.save_parsed(self.post_path, post))
+        self.assertIsNone(yaml_utils.pop_parsed(self.post_path))
+
+
+class TestLoadPost(unittest.TestCase):
+    """Test the parse cache keyed by file metadata."""
+
+    def setUp(self):
+        """Set up a post file and an empty parse cache."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.post_path = Path(self.tmp.name) / "post.yaml"
+        self.post_path.write_text("title: Test\nplatforms: {}\n")
+        yaml_utils._load_yaml_cached.cache_clear()
+
+    def tearDown(self):
+        """Clean up."""
+        self.tmp.cleanup()
+
+    def test_unchanged_file_is_parsed_once(self):
+        """Loading the same file twice reuses the first parse."""
+        first = yaml_utils.load_post(self.post_path)
+        second = yaml_utils.load_post(str(self.post_path))
+
+        self.assertEqual(first, {"title": "Test", "platforms": {}})
+        self.assertEqual(first, second)
+        self.assertEqual(yaml_utils._load_yaml_cached.cache_info().misses, 1)
+
+    def test_callers_get_independent_copies(self):
+        """Mutating a loaded post doesn't leak into later loads."""
+        yaml_utils.load_post(self.post_path)["platforms"]["x"] = {}
+
+        self.assertEqual(yaml_utils.load_post(self.post_path)["platforms"], {})
+
+    def test_edited_file_is_reparsed(self):
+        """A change in size or modification time forces a fresh parse."""
+        yaml_utils.load_post(self.post_path)
+        self.post_path.write_text("title: Edited\nplatforms: {}\n")
+
+        self.assertEqual(yaml_utils.load_post(self.post_path)["title"], "Edited")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Tests for Zapier webhook publishing.
+"""
+
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from policyengine_social.publishers.zapier import ZapierPublisher
+
+WEBHOOK_URL = "https://hooks.zapier.com/hooks/catch/123/abc/"
+
+
+class TestZapierPublisher(unittest.TestCase):
+    """Test cases for sending posts to a Zapier webhook."""
+
+    def setUp(self):
+        """Set up a publisher whose session never reaches the network."""
+        self.publisher = ZapierPublisher(WEBHOOK_URL)
+        self.post = patch.object(self.publisher._session, "post").start()
+        self.post.return_value = MagicMock(status_code=200, content=b'{"id": "1"}')
+        self.addCleanup(patch.stopall)
+
+    def test_calls_reuse_one_session(self):
+        """Posts and threads go through the same pooled session."""
+        self.publisher.publish("Hello", link="https://policyengine.org")
+        result = self.publisher.publish_thread(["First", "Second"])
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["response"], {"id": "1"})
+        self.assertEqual(self.post.call_count, 2)
+
+        url = self.post.call_args[0][0]
+        payload = json.loads(self.post.call_args.kwargs["data"])
+        self.assertEqual(url, WEBHOOK_URL)
+        self.assertEqual(payload["posts"], ["First", "Second"])
+
+    def test_publish_many(self):
+        """Several posts are each sent, with results in order."""
+        results = self.publisher.publish_many(
+            [{"content": "First"}, {"content": "Second", "link": "https://x.org"}]
+        )
+
+        self.assertEqual([r["success"] for r in results], [True, True])
+        contents = {
+            json.loads(call.kwargs["data"])["content"]
+            for call in self.post.call_args_list
+        }
+        self.assertEqual(contents, {"First", "Second"})
+        self.assertEqual(self.publisher.publish_many([]), [])
+
+    def test_publish_batch(self):
+        """A batch of posts goes out in one webhook call."""
+        items = [{"content": "First"}, {"content": "Second"}]
+
+        result = self.publisher.publish_batch(items, metadata={"slug": "test"})
+
+        self.assertTrue(result["success"])
+        self.post.assert_called_once()
+        payload = json.loads(self.post.call_args.kwargs["data"])
+        self.assertEqual(payload["type"], "batch")
+        self.assertEqual(payload["posts"], items)
+        self.assertEqual(payload["metadata"], {"slug": "test"})
+
+    def test_context_manager_closes_session(self):
+        """Leaving a with block closes the session."""
+        with patch.object(self.publisher._session, "close") as mock_close:
+            with self.publisher as publisher:
+                self.assertIs(publisher, self.publisher)
+
+        mock_close.assert_called_once()
+
+
+def _response(status_code, headers=None):
+    """Build a webhook response with the given status."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers.update(headers or {})
+    response._content = b"{}"
+    return response
+
+
+@patch("policyengine_social.publishers.zapier.time.sleep")
+class TestZapierRetries(unittest.TestCase):
+    """Test cases for retrying failed webhook calls."""
+
+    def setUp(self):
+        """Set up a publisher whose session never reaches the network."""
+        self.publisher = ZapierPublisher(WEBHOOK_URL, max_retries=2)
+        self.post = patch.object(self.publisher._session, "post").start()
+        self.addCleanup(patch.stopall)
+
+    def test_server_errors_are_retried(self, mock_sleep):
+        """5xx responses and dropped connections are sent again."""
+        self.post.side_effect = [
+            _response(503),
+            requests.exceptions.ConnectionError("reset"),
+            _response(200),
+        ]
+
+        result = self.publisher.publish("Hello")
+
+        self.assertTrue(result["success"])
+        self.assertEqual(self.post.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        for call, bound in zip(mock_sleep.call_args_list, [0.25, 0.5]):
+            self.assertLessEqual(call[0][0], bound)
+
+    def test_client_errors_are_not_retried(self, mock_sleep):
+        """4xx responses and read timeouts fail straight away."""
+        for error in [_response(400), requests.exceptions.ReadTimeout("slow")]:
+            self.post.reset_mock()
+            self.post.side_effect = [error]
+
+            result = self.publisher.publish("Hello")
+
+            self.assertFalse(result["success"])
+            self.post.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    def test_retry_after_is_honoured_up_to_cap(self, mock_sleep):
+        """A Retry-After header sets the delay, but never past the cap."""
+        self.post.side_effect = [
+            _response(429, {"Retry-After": "5"}),
+            _response(429, {"Retry-After": "120"}),
+            _response(429),
+        ]
+
+        result = self.publisher.publish_thread(["First", "Second"])
+
+        self.assertFalse(result["success"])
+        self.assertIn("429", result["error"])
+        self.assertEqual(mock_sleep.call_args_list[0][0][0], 5.0)
+        self.assertEqual(mock_sleep.call_args_list[1][0][0], 30.0)
+
+    def test_negative_max_retries_is_rejected(self, mock_sleep):
+        """Every call needs at least one attempt."""
+        with self.assertRaises(ValueError):
+            ZapierPublisher(WEBHOOK_URL, max_retries=-1)
+
+
+if __name__ == "__main__":
+    unittest.main()